@@ -1,13 +1,5 @@
-import subprocess
-import sys
-from distutils.version import LooseVersion
-
-reqs = subprocess.check_output([sys.executable, '-m', 'pip', 'freeze'])
-installed_packages = [r.decode().split('==')[0] for r in reqs.split()]
-
-if 'torch' in installed_packages:
-    from rlcard.agents.dqn_agent import DQNAgent as DQNAgent
-    from rlcard.agents.nfsp_agent import NFSPAgent as NFSPAgent
+import importlib
+import importlib.util
 
 from rlcard.agents.cfr_agent import CFRAgent
 from rlcard.agents.human_agents.limit_holdem_human_agent import HumanAgent as LimitholdemHumanAgent
@@ -16,3 +8,18 @@ from rlcard.agents.human_agents.leduc_holdem_human_agent import HumanAgent as Le
 from rlcard.agents.human_agents.blackjack_human_agent import HumanAgent as BlackjackHumanAgent
 # from rlcard.agents.human_agents.uno_human_agent import HumanAgent as UnoHumanAgent
 from rlcard.agents.random_agent import RandomAgent
+from rlcard.agents.pimc_agent import PIMCAgent
+
+# The torch agents are imported on first access, so importing the package
+# does not pay for torch
+_TORCH_AGENTS = {
+    'DQNAgent': 'rlcard.agents.dqn_agent',
+    'NFSPAgent': 'rlcard.agents.nfsp_agent',
+}
+
+def __getattr__(name):
+    if name in _TORCH_AGENTS and importlib.util.find_spec('torch') is not None:
+        agent = getattr(importlib.import_module(_TORCH_AGENTS[name]), name)
+        globals()[name] = agent
+        return agent
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
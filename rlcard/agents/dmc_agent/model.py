@@ -18,6 +18,8 @@ import numpy as np
 import torch
 from torch import nn
 
+from rlcard.utils.utils import random_legal_actions
+
 class DMCNet(nn.Module):
     def __init__(
         self,
@@ -75,7 +77,8 @@ class DMCAgent:
         action = action_keys[action_idx]
 
         info = {}
-        info['values'] = {state['raw_legal_actions'][i]: float(values[i]) for i in range(len(action_keys))}
+        values = dict(zip(action_keys, values))
+        info['values'] = {raw_action: float(values[action_id]) for raw_action, action_id in zip(state['raw_legal_actions'], state['legal_actions'])}
 
         return action, info
 
@@ -91,15 +94,10 @@ class DMCAgent:
     def predict(self, state):
         # Prepare obs and actions
         obs = state['obs'].astype(np.float32)
-        legal_actions = state['legal_actions']
-        action_keys = np.array(list(legal_actions.keys()))
-        action_values = list(legal_actions.values())
-        # One-hot encoding if there is no action features
-        for i in range(len(action_values)):
-            if action_values[i] is None:
-                action_values[i] = np.zeros(self.action_shape[0])
-                action_values[i][action_keys[i]] = 1
-        action_values = np.array(action_values, dtype=np.float32)
+        # One-hot encoding of the legal actions, there are no action features
+        action_keys = np.flatnonzero(state['legal_mask'])
+        action_values = np.zeros((len(action_keys), self.action_shape[0]), dtype=np.float32)
+        action_values[np.arange(len(action_keys)), action_keys] = 1
 
         obs = np.repeat(obs[np.newaxis, :], len(action_keys), axis=0)
 
@@ -109,6 +107,60 @@ class DMCAgent:
 
         return action_keys, values.cpu().detach().numpy()
 
+    def predict_batch(self, obs, legal_masks):
+        ''' Values of the legal actions of many states with one forward pass
+
+        Args:
+            obs (numpy.array): (batch, state_shape) observations, e.g. from
+                a vectorized environment
+            legal_masks (numpy.array): (batch, num_actions) legal-action masks
+
+        Returns:
+            values (numpy.array): (batch, num_actions) values, -inf for
+                illegal actions
+        '''
+        obs = np.asarray(obs, dtype=np.float32)
+        rows, action_keys = np.nonzero(legal_masks)
+        # One (observation, one-hot action) pair per legal action
+        action_values = np.zeros((len(action_keys), self.action_shape[0]), dtype=np.float32)
+        action_values[np.arange(len(action_keys)), action_keys] = 1
+
+        values = np.full(np.shape(legal_masks), -np.inf, dtype=np.float32)
+        with torch.no_grad():
+            pair_values = self.net.forward(torch.from_numpy(obs[rows]).to(self.device),
+                                           torch.from_numpy(action_values).to(self.device))
+        values[rows, action_keys] = pair_values.cpu().numpy()
+        return values
+
+    def step_batch(self, obs, legal_masks):
+        ''' Actions of many states, like step
+
+        Args:
+            obs (numpy.array): (batch, state_shape) observations
+            legal_masks (numpy.array): (batch, num_actions) legal-action masks
+
+        Returns:
+            actions (numpy.array): (batch,) action ids, 0 for rows without
+                legal actions
+        '''
+        actions = self.eval_step_batch(obs, legal_masks)
+        if self.exp_epsilon > 0:
+            explore = np.random.random_sample(len(actions)) < self.exp_epsilon
+            actions = np.where(explore, random_legal_actions(legal_masks), actions)
+        return actions
+
+    def eval_step_batch(self, obs, legal_masks):
+        ''' Greedy actions of many states, like eval_step
+
+        Args:
+            obs (numpy.array): (batch, state_shape) observations
+            legal_masks (numpy.array): (batch, num_actions) legal-action masks
+
+        Returns:
+            actions (numpy.array): (batch,) action ids
+        '''
+        return np.argmax(self.predict_batch(obs, legal_masks), axis=1)
+
     def forward(self, obs, actions):
         return self.net.forward(obs, actions)
 
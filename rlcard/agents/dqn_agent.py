@@ -25,16 +25,11 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
-import random
 import numpy as np
 import torch
 import torch.nn as nn
-from collections import namedtuple
-from copy import deepcopy
 
-from rlcard.utils.utils import remove_illegal
-
-Transition = namedtuple('Transition', ['state', 'action', 'reward', 'next_state', 'legal_actions', 'done'])
+from rlcard.utils.utils import random_legal_actions
 
 
 class DQNAgent(object):
@@ -56,7 +51,13 @@ class DQNAgent(object):
                  train_every=1,
                  mlp_layers=None,
                  learning_rate=0.00005,
-                 device=None):
+                 device=None,
+                 prioritized_replay=False,
+                 priority_alpha=0.6,
+                 priority_beta_start=0.4,
+                 priority_beta_end=1.0,
+                 priority_beta_steps=20000,
+                 target_update_tau=None):
 
         '''
         Q-Learning algorithm for off-policy TD control using Function Approximation.
@@ -81,6 +82,17 @@ class DQNAgent(object):
             mlp_layers (list): The layer number and the dimension of each layer in MLP
             learning_rate (float): The learning rate of the DQN agent.
             device (torch.device): whether to use the cpu or gpu
+            prioritized_replay (boolean): Sample transitions in proportion to their
+              TD errors and correct the bias with importance-sampling weights
+            priority_alpha (float): How much the TD errors shape the priorities,
+              0 is uniform sampling
+            priority_beta_start (float): Importance-sampling exponent at the start,
+              it is annealed over time
+            priority_beta_end (float): The final importance-sampling exponent
+            priority_beta_steps (int): Number of training steps to anneal beta over
+            target_update_tau (float): If set, move the target estimator towards the
+              Q estimator by this fraction after every training step (Polyak averaging)
+              instead of copying it every update_target_estimator_every steps
         '''
         self.use_raw = False
         self.replay_memory_init_size = replay_memory_init_size
@@ -90,6 +102,9 @@ class DQNAgent(object):
         self.batch_size = batch_size
         self.num_actions = num_actions
         self.train_every = train_every
+        self.prioritized_replay = prioritized_replay
+        self.priority_beta_steps = priority_beta_steps
+        self.target_update_tau = target_update_tau
 
         # Torch device
         if device is None:
@@ -106,14 +121,21 @@ class DQNAgent(object):
         # The epsilon decay scheduler
         self.epsilons = np.linspace(epsilon_start, epsilon_end, epsilon_decay_steps)
 
+        # The importance-sampling exponent scheduler
+        self.priority_betas = np.linspace(priority_beta_start, priority_beta_end, priority_beta_steps)
+
         # Create estimators
         self.q_estimator = Estimator(num_actions=num_actions, learning_rate=learning_rate, state_shape=state_shape, \
             mlp_layers=mlp_layers, device=self.device)
         self.target_estimator = Estimator(num_actions=num_actions, learning_rate=learning_rate, state_shape=state_shape, \
             mlp_layers=mlp_layers, device=self.device)
+        self.target_estimator.qnet.load_state_dict(self.q_estimator.qnet.state_dict())
 
         # Create replay memory
-        self.memory = Memory(replay_memory_size, batch_size)
+        if prioritized_replay:
+            self.memory = PrioritizedMemory(replay_memory_size, batch_size, priority_alpha)
+        else:
+            self.memory = Memory(replay_memory_size, batch_size)
 
     def feed(self, ts):
         ''' Store data in to replay buffer and train the agent. There are two stages.
@@ -124,7 +146,7 @@ class DQNAgent(object):
             ts (list): a list of 5 elements that represent the transition
         '''
         (state, action, reward, next_state, done) = tuple(ts)
-        self.feed_memory(state['obs'], action, reward, next_state['obs'], list(next_state['legal_actions'].keys()), done)
+        self.feed_memory(state['obs'], action, reward, next_state['obs'], next_state['legal_mask'], done)
         self.total_t += 1
         tmp = self.total_t - self.replay_memory_init_size
         if tmp>=0 and tmp%self.train_every == 0:
@@ -142,13 +164,12 @@ class DQNAgent(object):
         '''
         q_values = self.predict(state)
         epsilon = self.epsilons[min(self.total_t, self.epsilon_decay_steps-1)]
-        legal_actions = list(state['legal_actions'].keys())
-        probs = np.ones(len(legal_actions), dtype=float) * epsilon / len(legal_actions)
-        best_action_idx = legal_actions.index(np.argmax(q_values))
-        probs[best_action_idx] += (1.0 - epsilon)
-        action_idx = np.random.choice(np.arange(len(probs)), p=probs)
+        legal_mask = state['legal_mask']
+        probs = legal_mask * (epsilon / np.count_nonzero(legal_mask))
+        probs[np.argmax(q_values)] += (1.0 - epsilon)
+        action = np.random.choice(self.num_actions, p=probs)
 
-        return legal_actions[action_idx]
+        return action
 
     def eval_step(self, state):
         ''' Predict the action for evaluation purpose.
@@ -164,7 +185,7 @@ class DQNAgent(object):
         best_action = np.argmax(q_values)
 
         info = {}
-        info['values'] = {state['raw_legal_actions'][i]: float(q_values[list(state['legal_actions'].keys())[i]]) for i in range(len(state['legal_actions']))}
+        info['values'] = {raw_action: float(q_values[action_id]) for raw_action, action_id in zip(state['raw_legal_actions'], state['legal_actions'])}
 
         return best_action, info
 
@@ -179,44 +200,95 @@ class DQNAgent(object):
         '''
         
         q_values = self.q_estimator.predict_nograd(np.expand_dims(state['obs'], 0))[0]
-        masked_q_values = -np.inf * np.ones(self.num_actions, dtype=float)
-        legal_actions = list(state['legal_actions'].keys())
-        masked_q_values[legal_actions] = q_values[legal_actions]
+        masked_q_values = np.where(state['legal_mask'], q_values, -np.inf)
 
         return masked_q_values
 
+    def predict_batch(self, obs, legal_masks):
+        ''' Predict the masked Q-values of many states with one forward pass
+
+        Args:
+            obs (numpy.array): (batch, state_shape) observations, e.g. from
+                a vectorized environment
+            legal_masks (numpy.array): (batch, num_actions) legal-action masks
+
+        Returns:
+            q_values (numpy.array): (batch, num_actions) Q values, -inf for
+                illegal actions
+        '''
+        q_values = self.q_estimator.predict_nograd(np.asarray(obs))
+        return np.where(legal_masks, q_values, -np.inf)
+
+    def step_batch(self, obs, legal_masks):
+        ''' Epsilon-greedy actions of many states, like step
+
+        Args:
+            obs (numpy.array): (batch, state_shape) observations
+            legal_masks (numpy.array): (batch, num_actions) legal-action masks
+
+        Returns:
+            actions (numpy.array): (batch,) action ids, 0 for rows without
+                legal actions
+        '''
+        q_values = self.predict_batch(obs, legal_masks)
+        epsilon = self.epsilons[min(self.total_t, self.epsilon_decay_steps-1)]
+        explore = np.random.random_sample(len(q_values)) < epsilon
+        return np.where(explore, random_legal_actions(legal_masks), np.argmax(q_values, axis=1))
+
+    def eval_step_batch(self, obs, legal_masks):
+        ''' Greedy actions of many states, like eval_step
+
+        Args:
+            obs (numpy.array): (batch, state_shape) observations
+            legal_masks (numpy.array): (batch, num_actions) legal-action masks
+
+        Returns:
+            actions (numpy.array): (batch,) action ids
+        '''
+        return np.argmax(self.predict_batch(obs, legal_masks), axis=1)
+
     def train(self):
         ''' Train the network
 
         Returns:
             loss (float): The loss of the current batch.
         '''
-        state_batch, action_batch, reward_batch, next_state_batch, legal_actions_batch, done_batch = self.memory.sample()
-
-        # Calculate best next actions using Q-network (Double DQN)
-        q_values_next = self.q_estimator.predict_nograd(next_state_batch)
-        legal_actions = []
-        for b in range(self.batch_size):
-            legal_actions.extend([i + b * self.num_actions for i in legal_actions_batch[b]])
-        masked_q_values = -np.inf * np.ones(self.num_actions * self.batch_size, dtype=float)
-        masked_q_values[legal_actions] = q_values_next.flatten()[legal_actions]
-        masked_q_values = masked_q_values.reshape((self.batch_size, self.num_actions))
-        best_actions = np.argmax(masked_q_values, axis=1)
-
-        # Evaluate best next actions using Target-network (Double DQN)
-        q_values_next_target = self.target_estimator.predict_nograd(next_state_batch)
-        target_batch = reward_batch + np.invert(done_batch).astype(np.float32) * \
-            self.discount_factor * q_values_next_target[np.arange(self.batch_size), best_actions]
+        if self.prioritized_replay:
+            beta = self.priority_betas[min(self.train_t, self.priority_beta_steps-1)]
+            state_batch, action_batch, reward_batch, next_state_batch, legal_mask_batch, done_batch, \
+                indices, weights = self.memory.sample(beta)
+        else:
+            state_batch, action_batch, reward_batch, next_state_batch, legal_mask_batch, done_batch = self.memory.sample()
+            weights = None
 
-        # Perform gradient descent update
-        state_batch = np.array(state_batch)
+        # Move the batch to the device once, the targets stay on the device
+        state_batch = torch.from_numpy(state_batch).to(self.device)
+        action_batch = torch.from_numpy(action_batch).to(self.device)
+        next_state_batch = torch.from_numpy(next_state_batch).to(self.device)
+        legal_mask_batch = torch.from_numpy(legal_mask_batch).to(self.device)
+        not_done_batch = torch.from_numpy(~done_batch).to(self.device)
+        reward_batch = torch.from_numpy(reward_batch).to(self.device)
+
+        with torch.no_grad():
+            # Calculate best next actions using Q-network (Double DQN)
+            q_values_next = self.q_estimator.qnet(next_state_batch)
+            best_actions = q_values_next.masked_fill(~legal_mask_batch, -np.inf).argmax(dim=1, keepdim=True)
 
-        loss = self.q_estimator.update(state_batch, action_batch, target_batch)
+            # Evaluate best next actions using Target-network (Double DQN)
+            q_values_next_target = self.target_estimator.qnet(next_state_batch).gather(1, best_actions).squeeze(1)
+            target_batch = reward_batch + not_done_batch * self.discount_factor * q_values_next_target
+
+        # Perform gradient descent update
+        loss = self.q_estimator.update(state_batch, action_batch, target_batch, weights)
+        if self.prioritized_replay:
+            self.memory.update_priorities(indices, self.q_estimator.last_td_errors)
         print('\rINFO - Step {}, rl-loss: {}'.format(self.total_t, loss), end='')
 
-        # Update the target estimator
-        if self.train_t % self.update_target_estimator_every == 0:
-            self.target_estimator = deepcopy(self.q_estimator)
+        # Update the target estimator in place
+        if self.target_update_tau is not None:
+            self.target_estimator.soft_update(self.q_estimator, self.target_update_tau)
+        elif self.train_t % self.update_target_estimator_every == 0:
+            self.target_estimator.qnet.load_state_dict(self.q_estimator.qnet.state_dict())
             print("\nINFO - Copied model parameters to target network.")
 
         self.train_t += 1
@@ -229,7 +301,7 @@ class DQNAgent(object):
             action (int): the performed action ID
             reward (float): the reward received
             next_state (numpy.array): the next state after performing the action
-            legal_actions (list): the legal actions of the next state
+            legal_actions (numpy.array): the legal-action mask of the next state
             done (boolean): whether the episode is finished
         '''
         self.memory.save(state, action, reward, next_state, legal_actions, done)
@@ -262,6 +334,8 @@ class Estimator(object):
         self.state_shape = state_shape
         self.mlp_layers = mlp_layers
         self.device = device
+        # Absolute TD errors of the last update
+        self.last_td_errors = None
 
         # set up Q model and place it in eval mode
         qnet = EstimatorNetwork(num_actions, state_shape, mlp_layers)
@@ -297,7 +371,7 @@ class Estimator(object):
             q_as = self.qnet(s).cpu().numpy()
         return q_as
 
-    def update(self, s, a, y):
+    def update(self, s, a, y, weights=None):
         ''' Updates the estimator towards the given targets.
             In this case y is the target-network estimated
             value of the Q-network optimal actions, which
@@ -307,17 +381,22 @@ class Estimator(object):
           s (np.ndarray): (batch, state_shape) state representation
           a (np.ndarray): (batch,) integer sampled actions
           y (np.ndarray): (batch,) value of optimal actions according to Q-target
+          weights (np.ndarray): (batch,) importance-sampling weights of the
+            squared errors, the plain mean if None
+
+          Tensors already on the device are used as they are.
 
         Returns:
-          The calculated loss on the batch.
+          The calculated loss on the batch. With weights the absolute TD
+          errors, for the replay priorities, are kept in last_td_errors.
         '''
         self.optimizer.zero_grad()
 
         self.qnet.train()
 
-        s = torch.from_numpy(s).float().to(self.device)
-        a = torch.from_numpy(a).long().to(self.device)
-        y = torch.from_numpy(y).float().to(self.device)
+        s = torch.as_tensor(s, dtype=torch.float32, device=self.device)
+        a = torch.as_tensor(a, dtype=torch.long, device=self.device)
+        y = torch.as_tensor(y, dtype=torch.float32, device=self.device)
 
         # (batch, state_shape) -> (batch, num_actions)
         q_as = self.qnet(s)
@@ -326,7 +405,14 @@ class Estimator(object):
         Q = torch.gather(q_as, dim=-1, index=a.unsqueeze(-1)).squeeze(-1)
 
         # update model
-        batch_loss = self.mse_loss(Q, y)
+        if weights is None:
+            batch_loss = self.mse_loss(Q, y)
+            self.last_td_errors = None
+        else:
+            weights = torch.as_tensor(weights, dtype=torch.float32, device=self.device)
+            td_errors = Q - y
+            batch_loss = torch.mean(weights * td_errors ** 2)
+            self.last_td_errors = td_errors.detach().abs().cpu().numpy()
         batch_loss.backward()
         self.optimizer.step()
         batch_loss = batch_loss.item()
@@ -335,6 +421,21 @@ class Estimator(object):
 
         return batch_loss
 
+    def soft_update(self, source, tau):
+        ''' Move the parameters towards those of another estimator,
+            p = (1 - tau) * p + tau * p_source, in place
+
+        Args:
+          source (Estimator): the estimator to follow
+          tau (float): the fraction to move
+        '''
+        with torch.no_grad():
+            for param, source_param in zip(self.qnet.parameters(), source.qnet.parameters()):
+                param.lerp_(source_param, tau)
+            # Batch norm statistics are copied
+            for buffer, source_buffer in zip(self.qnet.buffers(), source.qnet.buffers()):
+                buffer.copy_(source_buffer)
+
 
 class EstimatorNetwork(nn.Module):
     ''' The function approximation network for Estimator
@@ -374,7 +475,7 @@ class EstimatorNetwork(nn.Module):
         return self.fc_layers(s)
 
 class Memory(object):
-    ''' Memory for saving transitions
+    ''' Ring buffer of transitions in preallocated numpy arrays
     '''
 
     def __init__(self, memory_size, batch_size):
@@ -384,33 +485,185 @@ class Memory(object):
         '''
         self.memory_size = memory_size
         self.batch_size = batch_size
-        self.memory = []
+        # The arrays are allocated on the first save, when the shapes are known
+        self.states = None
+        self.actions = None
+        self.rewards = None
+        self.next_states = None
+        self.legal_actions = None
+        self.dones = None
+        self.size = 0
+        self.position = 0
+
+    def __len__(self):
+        return self.size
 
     def save(self, state, action, reward, next_state, legal_actions, done):
-        ''' Save transition into memory
+        ''' Save transition into memory, overwriting the oldest one when full
 
         Args:
             state (numpy.array): the current state
             action (int): the performed action ID
             reward (float): the reward received
             next_state (numpy.array): the next state after performing the action
-            legal_actions (list): the legal actions of the next state
+            legal_actions (numpy.array): the legal-action mask of the next state
             done (boolean): whether the episode is finished
         '''
-        if len(self.memory) == self.memory_size:
-            self.memory.pop(0)
-        transition = Transition(state, action, reward, next_state, legal_actions, done)
-        self.memory.append(transition)
+        if self.states is None:
+            self._allocate(np.shape(state), np.shape(legal_actions))
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.legal_actions[i] = legal_actions
+        self.dones[i] = done
+        self.position = (i + 1) % self.memory_size
+        self.size = min(self.size + 1, self.memory_size)
 
     def sample(self):
         ''' Sample a minibatch from the replay memory
 
         Returns:
-            state_batch (list): a batch of states
-            action_batch (list): a batch of actions
-            reward_batch (list): a batch of rewards
-            next_state_batch (list): a batch of states
-            done_batch (list): a batch of dones
+            state_batch (numpy.array): a batch of states
+            action_batch (numpy.array): a batch of actions
+            reward_batch (numpy.array): a batch of rewards
+            next_state_batch (numpy.array): a batch of states
+            legal_actions_batch (numpy.array): a batch of legal-action masks
+            done_batch (numpy.array): a batch of dones
+        '''
+        indices = np.random.randint(self.size, size=self.batch_size)
+        return self.states[indices], self.actions[indices], self.rewards[indices], \
+            self.next_states[indices], self.legal_actions[indices], self.dones[indices]
+
+    def _allocate(self, state_shape, mask_shape):
+        self.states = np.zeros((self.memory_size,) + state_shape, dtype=np.float32)
+        self.actions = np.zeros(self.memory_size, dtype=np.int64)
+        self.rewards = np.zeros(self.memory_size, dtype=np.float32)
+        self.next_states = np.zeros((self.memory_size,) + state_shape, dtype=np.float32)
+        self.legal_actions = np.zeros((self.memory_size,) + mask_shape, dtype=np.bool_)
+        self.dones = np.zeros(self.memory_size, dtype=np.bool_)
+
+class SumTree(object):
+    ''' Binary tree in an array where every node holds the sum of its children
+
+    The leaves are the priorities, so a prefix sum search finds a leaf with
+    probability proportional to its priority in O(log n).
+    '''
+
+    def __init__(self, capacity):
+        ''' Initialize
+        Args:
+            capacity (int): the number of leaves
+        '''
+        self.capacity = capacity
+        # A full tree, node i has children 2i and 2i+1 and the root is 1
+        self.num_leaves = 1
+        while self.num_leaves < capacity:
+            self.num_leaves *= 2
+        self.tree = np.zeros(2 * self.num_leaves, dtype=np.float64)
+
+    def total(self):
+        return self.tree[1]
+
+    def set(self, index, priority):
+        ''' Set the priority of one leaf '''
+        node = index + self.num_leaves
+        self.tree[node] = priority
+        node //= 2
+        while node >= 1:
+            self.tree[node] = self.tree[2 * node] + self.tree[2 * node + 1]
+            node //= 2
+
+    def update(self, indices, priorities):
+        ''' Set the priorities of many leaves
+
+        Args:
+            indices (numpy.array): leaf indices
+            priorities (numpy.array): the new priorities
+        '''
+        nodes = np.asarray(indices) + self.num_leaves
+        self.tree[nodes] = priorities
+        nodes = np.unique(nodes // 2)
+        while nodes[0] >= 1:
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            nodes = np.unique(nodes // 2)
+
+    def find(self, values):
+        ''' Find the leaves where the prefix sums reach the values
+
+        Args:
+            values (numpy.array): values in [0, total)
+
+        Returns:
+            (numpy.array): leaf indices
+        '''
+        nodes = np.ones(len(values), dtype=np.int64)
+        values = np.array(values, dtype=np.float64)
+        while nodes[0] < self.num_leaves:
+            left = 2 * nodes
+            left_sums = self.tree[left]
+            right = values >= left_sums
+            values -= np.where(right, left_sums, 0)
+            nodes = left + right
+        return np.minimum(nodes - self.num_leaves, self.capacity - 1)
+
+class PrioritizedMemory(Memory):
+    ''' Replay memory that samples transitions in proportion to priority^alpha
+        (Schaul et al., 2016), with the priorities in a sum tree
+    '''
+
+    def __init__(self, memory_size, batch_size, alpha=0.6, epsilon=1e-6):
+        ''' Initialize
+        Args:
+            memory_size (int): the size of the memroy buffer
+            batch_size (int): the size of the sampled batches
+            alpha (float): the priority exponent, 0 is uniform sampling
+            epsilon (float): added to the TD errors so no transition has zero priority
+        '''
+        super().__init__(memory_size, batch_size)
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.tree = SumTree(memory_size)
+        self.max_priority = 1.0
+
+    def save(self, state, action, reward, next_state, legal_actions, done):
+        ''' Save transition into memory with the highest priority so far,
+            so it is sampled at least once
+        '''
+        self.tree.set(self.position, self.max_priority)
+        super().save(state, action, reward, next_state, legal_actions, done)
+
+    def sample(self, beta=0.4):
+        ''' Sample a minibatch, one transition from each of batch_size equal
+            slices of the total priority
+
+        Args:
+            beta (float): the importance-sampling exponent
+
+        Returns:
+            The batches of Memory.sample followed by the indices of the
+            transitions and their importance-sampling weights, normalized
+            so the largest weight of the batch is 1
+        '''
+        total = self.tree.total()
+        bounds = np.arange(self.batch_size) * (total / self.batch_size)
+        values = bounds + np.random.uniform(0, total / self.batch_size, self.batch_size)
+        indices = np.minimum(self.tree.find(values), self.size - 1)
+        probs = self.tree.tree[indices + self.tree.num_leaves] / total
+        weights = (self.size * probs) ** -beta
+        weights /= weights.max()
+        return self.states[indices], self.actions[indices], self.rewards[indices], \
+            self.next_states[indices], self.legal_actions[indices], self.dones[indices], \
+            indices, weights.astype(np.float32)
+
+    def update_priorities(self, indices, td_errors):
+        ''' Set the priorities of sampled transitions from their new TD errors
+
+        Args:
+            indices (numpy.array): the indices returned by sample
+            td_errors (numpy.array): the absolute TD errors
         '''
-        samples = random.sample(self.memory, self.batch_size)
-        return map(np.array, zip(*samples))
+        priorities = (np.asarray(td_errors, dtype=np.float64) + self.epsilon) ** self.alpha
+        self.tree.update(indices, priorities)
+        self.max_priority = max(self.max_priority, priorities.max())
@@ -167,7 +167,6 @@ class NFSPAgent(object):
             action (int): An action id
         '''
         obs = state['obs']
-        legal_actions = list(state['legal_actions'].keys())
         if self._mode == 'best_response':
             action = self._rl_agent.step(state)
             one_hot = np.zeros(self._num_actions)
@@ -176,7 +175,7 @@ class NFSPAgent(object):
 
         elif self._mode == 'average_policy':
             probs = self._act(obs)
-            probs = remove_illegal(probs, legal_actions)
+            probs = remove_illegal(probs, state['legal_mask'])
             action = np.random.choice(len(probs), p=probs)
 
         return action
@@ -195,16 +194,89 @@ class NFSPAgent(object):
             action, info = self._rl_agent.eval_step(state)
         elif self.evaluate_with == 'average_policy':
             obs = state['obs']
-            legal_actions = list(state['legal_actions'].keys())
             probs = self._act(obs)
-            probs = remove_illegal(probs, legal_actions)
+            probs = remove_illegal(probs, state['legal_mask'])
             action = np.random.choice(len(probs), p=probs)
             info = {}
-            info['probs'] = {state['raw_legal_actions'][i]: float(probs[list(state['legal_actions'].keys())[i]]) for i in range(len(state['legal_actions']))}
+            info['probs'] = {raw_action: float(probs[action_id]) for raw_action, action_id in zip(state['raw_legal_actions'], state['legal_actions'])}
         else:
             raise ValueError("'evaluate_with' should be either 'average_policy' or 'best_response'.")
         return action, info
 
+    def predict_batch(self, obs, legal_masks):
+        ''' Average-policy action probabilities of many states with one forward pass
+
+        Args:
+            obs (numpy.array): (batch, state_shape) observations, e.g. from
+                a vectorized environment
+            legal_masks (numpy.array): (batch, num_actions) legal-action masks
+
+        Returns:
+            probs (numpy.array): (batch, num_actions) probabilities of the
+                legal actions, uniform where the policy gives them no mass
+        '''
+        obs = torch.from_numpy(np.asarray(obs)).float().to(self.device)
+        with torch.no_grad():
+            probs = np.exp(self.policy_network(obs).cpu().numpy())
+        probs *= legal_masks
+        sums = probs.sum(axis=1, keepdims=True)
+        uniform = legal_masks / np.maximum(legal_masks.sum(axis=1, keepdims=True), 1)
+        return np.where(sums > 0, probs / np.where(sums > 0, sums, 1), uniform)
+
+    def step_batch(self, obs, legal_masks, active=None):
+        ''' Actions of many states, like step. All the states use the current
+            mode, so call sample_episode_policy between batches of episodes.
+
+        Args:
+            obs (numpy.array): (batch, state_shape) observations
+            legal_masks (numpy.array): (batch, num_actions) legal-action masks
+            active (numpy.array): (batch,) True for the rows that are real
+                decisions of this agent. Only these rows are added to the
+                reservoir buffer in best-response mode. Defaults to the rows
+                with a legal action, so pass it for vectorized environments
+                that keep the mask of finished games, e.g. ~dones
+
+        Returns:
+            actions (numpy.array): (batch,) action ids, 0 for rows without
+                legal actions
+        '''
+        if self._mode == 'best_response':
+            actions = self._rl_agent.step_batch(obs, legal_masks)
+            if active is None:
+                active = np.any(legal_masks, axis=1)
+            for i in np.flatnonzero(active):
+                one_hot = np.zeros(self._num_actions)
+                one_hot[actions[i]] = 1
+                # Copy the row, the observations may be reused by the environment
+                self._add_transition(np.array(obs[i]), one_hot)
+        else:
+            actions = self._sample_batch(self.predict_batch(obs, legal_masks))
+        return actions
+
+    def eval_step_batch(self, obs, legal_masks):
+        ''' Actions of many states for evaluation, like eval_step
+
+        Args:
+            obs (numpy.array): (batch, state_shape) observations
+            legal_masks (numpy.array): (batch, num_actions) legal-action masks
+
+        Returns:
+            actions (numpy.array): (batch,) action ids
+        '''
+        if self.evaluate_with == 'best_response':
+            return self._rl_agent.eval_step_batch(obs, legal_masks)
+        elif self.evaluate_with == 'average_policy':
+            return self._sample_batch(self.predict_batch(obs, legal_masks))
+        else:
+            raise ValueError("'evaluate_with' should be either 'average_policy' or 'best_response'.")
+
+    @staticmethod
+    def _sample_batch(probs):
+        ''' Sample one action from every row of probabilities '''
+        cumulative = probs.cumsum(axis=1)
+        draws = np.random.random_sample((len(probs), 1)) * cumulative[:, -1:]
+        return np.argmax(cumulative > draws, axis=1)
+
     def sample_episode_policy(self):
         ''' Sample average/best_response policy
         '''
@@ -0,0 +1,296 @@
+''' Perfect-information Monte Carlo (determinized) agent for Euchre
+'''
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from rlcard.games.euchre.double_dummy import DoubleDummySolver, _STRENGTH
+from rlcard.games.euchre.utils import ACTION_SPACE, CARD_INDEX, CARD_LIST, CARD_SUIT
+from rlcard.games.euchre.utils import TRUMP_MASK, FOLLOW_MASK
+
+# Solver of the current process, created on first use in every worker
+_SOLVER = None
+
+def _points(tricks):
+    ''' Points won by a team that takes tricks, see EuchreJudger.judge_hand '''
+    if tricks == 5:
+        return 2
+    if tricks >= 3:
+        return 1
+    if tricks == 0:
+        return -2
+    return -1
+
+def _suit_of(card, trump):
+    return trump if (1 << card) & TRUMP_MASK[trump] else CARD_SUIT[card]
+
+def _weakest_card(hand, trump):
+    ''' The card the dealer throws away after picking up, lowest off-suit first '''
+    cards = [card for card in range(len(CARD_LIST)) if hand >> card & 1]
+    return min(cards, key=lambda card: _STRENGTH[(trump, _suit_of(card, trump))][card])
+
+def _score_sample(solver, decision, hands):
+    ''' Score every candidate action on one deal with all hands visible
+
+    Returns:
+        (dict): Action id -> score for the team of the player to move
+    '''
+    kind, me = decision[0], decision[1]
+    if kind == 'play':
+        trump, leader, trick = decision[2:]
+        values = solver.solve_moves(hands, trump, leader, trick)
+        return {ACTION_SPACE[CARD_LIST[card]]: value for card, value in values.items()}
+
+    if kind == 'discard':
+        trump = decision[2]
+        scores = {}
+        hand = hands[me]
+        for card in range(len(CARD_LIST)):
+            if hand >> card & 1:
+                hands[me] = hand & ~(1 << card)
+                tricks = solver.solve(hands, trump, (me + 1) % 4)
+                scores[ACTION_SPACE['discard-' + CARD_LIST[card]]] = tricks[me % 2]
+        hands[me] = hand
+        return scores
+
+    # Bidding: play each candidate trump out and score the points
+    dealer, flipped, options = decision[2:]
+    scores = {}
+    for action, trump in options:
+        trump_hands = list(hands)
+        if action == ACTION_SPACE['pick']:
+            hand = trump_hands[dealer] | 1 << flipped
+            trump_hands[dealer] = hand & ~(1 << _weakest_card(hand, trump))
+        tricks = solver.solve(trump_hands, trump, (dealer + 1) % 4)
+        scores[action] = _points(tricks[me % 2])
+    return scores
+
+def _solve_samples(decision, samples):
+    ''' Sum the scores of a chunk of sampled deals. Runs in the pool workers.
+
+    Returns:
+        (tuple): The summed scores (dict) and the number of samples
+    '''
+    global _SOLVER
+    if _SOLVER is None:
+        _SOLVER = DoubleDummySolver()
+    totals = {}
+    for hands in samples:
+        for action, score in _score_sample(_SOLVER, decision, hands).items():
+            totals[action] = totals.get(action, 0) + score
+    return totals, len(samples)
+
+class PIMCAgent(object):
+    ''' Determinized search agent for Euchre
+
+    At every decision it samples deals of the hidden cards that are
+    consistent with what the player has seen (its hand, the flipped card,
+    the played cards and the suits other players showed out of), solves
+    every sample with the double-dummy solver and plays the action with the
+    best total. Samples are solved in chunks on a process pool when
+    num_workers > 0, and a decision stops at num_samples samples or after
+    time_limit seconds, whichever comes first.
+
+    Bidding compares the points each trump choice wins double dummy against
+    pass_value. After a pick up the dealer is assumed to throw away its
+    weakest card.
+    '''
+
+    def __init__(self, num_samples=50, time_limit=None, num_workers=0, chunk_size=5,
+                 pass_value=0.0, seed=None):
+        ''' Initialize the agent
+
+        Args:
+            num_samples (int): Maximum number of sampled deals per decision
+            time_limit (float): Seconds per decision, no limit if None. With
+                workers the chunks already running at the deadline are
+                finished, so a decision can run over by about one chunk
+            num_workers (int): Size of the process pool, 0 solves in process
+            chunk_size (int): Samples sent to a worker in one task
+            pass_value (float): Expected points of passing during bidding
+            seed (int): Seed of the deal sampler
+        '''
+        self.use_raw = False
+        self.num_samples = num_samples
+        self.time_limit = time_limit
+        self.num_workers = num_workers
+        self.chunk_size = chunk_size
+        self.pass_value = pass_value
+        self.rng = random.Random(seed)
+        self.pool = None
+
+    def step(self, state):
+        ''' Predict the action given the current state
+
+        Args:
+            state (dict): A Euchre state from EuchreEnv
+
+        Returns:
+            action (int): The action id
+        '''
+        action, _ = self.eval_step(state)
+        return action
+
+    def eval_step(self, state):
+        ''' Predict the action given the current state for evaluation
+
+        Args:
+            state (dict): A Euchre state from EuchreEnv
+
+        Returns:
+            action (int): The action id
+            info (dict): The mean sample score of every candidate action
+        '''
+        legal_actions = list(state['legal_actions'])
+        if len(legal_actions) == 1:
+            return legal_actions[0], {}
+
+        decision = self._decision(state)
+        totals, count = self._evaluate(state, decision)
+        values = {action: totals[action] / count for action in totals}
+        if decision[0] == 'bid' and ACTION_SPACE['pass'] in state['legal_actions']:
+            values[ACTION_SPACE['pass']] = self.pass_value
+        action = max(legal_actions, key=lambda a: values.get(a, float('-inf')))
+        info = {'values': {state['raw_legal_actions'][i]: values.get(a)
+                           for i, a in enumerate(legal_actions)}, 'samples': count}
+        return action, info
+
+    def _decision(self, state):
+        ''' The part of the decision that is the same for every sample '''
+        me = state['player_id']
+        trump = state['trump']
+        if trump is None:
+            flipped = CARD_INDEX[state['flipped']]
+            options = []
+            for action in state['raw_legal_actions']:
+                if action == 'pick':
+                    options.append((ACTION_SPACE[action], CARD_SUIT[flipped]))
+                elif action.startswith('call'):
+                    options.append((ACTION_SPACE[action], action[5]))
+            return ('bid', me, state['dealer_actor'], flipped, options)
+        if len(state['hand']) == 6:
+            return ('discard', me, trump)
+        trick = [CARD_INDEX[card.get_index()] for card in state['center']]
+        leader = state['order'][0] if state['order'] else me
+        return ('play', me, trump, leader, trick)
+
+    def _evaluate(self, state, decision):
+        ''' Sum the sample scores of every action within the budget '''
+        deadline = None if self.time_limit is None else time.time() + self.time_limit
+        sampler = self._sampler(state)
+        if self.num_workers <= 0:
+            totals, count = {}, 0
+            while count < self.num_samples and (count == 0 or deadline is None or time.time() < deadline):
+                scores, _ = _solve_samples(decision, [sampler()])
+                for action, score in scores.items():
+                    totals[action] = totals.get(action, 0) + score
+                count += 1
+            return totals, count
+
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.num_workers)
+        # Keep one chunk per worker in flight and deal the samples of a chunk
+        # only when it is submitted, so nothing is queued past the deadline
+        totals, count, submitted = {}, 0, 0
+        pending = set()
+        while True:
+            while (len(pending) < self.num_workers and submitted < self.num_samples
+                   and (submitted == 0 or deadline is None or time.time() < deadline)):
+                samples = [sampler() for _ in range(min(self.chunk_size, self.num_samples - submitted))]
+                pending.add(self.pool.submit(_solve_samples, decision, samples))
+                submitted += len(samples)
+            if not pending:
+                return totals, count
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                scores, num = future.result()
+                for action, score in scores.items():
+                    totals[action] = totals.get(action, 0) + score
+                count += num
+
+    def _sampler(self, state):
+        ''' Build a function that deals the unseen cards at random
+
+        Returns:
+            (function): Returns a list of 4 hand masks consistent with state
+        '''
+        me = state['player_id']
+        dealer = state['dealer_actor']
+        trump = state['trump']
+        played = [[CARD_INDEX[card] for card in cards] for cards in state['played']]
+        flipped = CARD_INDEX[state['flipped']]
+
+        known = [0, 0, 0, 0]
+        for card in state['hand']:
+            known[me] |= 1 << CARD_INDEX[card]
+        sizes = [5 - len(cards) for cards in played]
+        sizes[me] = len(state['hand'])
+        seen = known[me] | 1 << flipped
+        for cards in played:
+            for card in cards:
+                seen |= 1 << card
+        if state['discarded_card'] is not None and dealer == me:
+            seen |= 1 << CARD_INDEX[state['discarded_card']]
+        unseen = [card for card in range(len(CARD_LIST)) if not seen >> card & 1]
+
+        voids = [0, 0, 0, 0] if trump is None else self._voids(state, played, trump)
+        if state['flipped_choice'][1] and flipped not in played[dealer] and dealer != me:
+            # A picked up card is with the dealer, unless it was discarded
+            if sizes[dealer] and not voids[dealer] & 1 << flipped:
+                known[dealer] |= 1 << flipped
+            else:
+                for seat in range(4):
+                    if seat != dealer:
+                        voids[seat] |= 1 << flipped
+                unseen.append(flipped)
+        others = sorted((seat for seat in range(4) if seat != me), key=lambda seat: -bin(voids[seat]).count('1'))
+        rng = self.rng
+
+        def sample():
+            for attempt in range(100):
+                # Give up on the void constraints when they keep failing
+                constrained = attempt < 99
+                pool = unseen[:]
+                rng.shuffle(pool)
+                hands = list(known)
+                for seat in others:
+                    need = sizes[seat] - bin(known[seat]).count('1')
+                    cards = [card for card in pool if not (constrained and (1 << card) & voids[seat])][:need]
+                    if len(cards) < need:
+                        break
+                    for card in cards:
+                        hands[seat] |= 1 << card
+                        pool.remove(card)
+                else:
+                    return hands
+            raise ValueError('No deal is consistent with the state')
+        return sample
+
+    @staticmethod
+    def _voids(state, played, trump):
+        ''' Masks of the cards each player can not hold, from failures to follow '''
+        voids = [0, 0, 0, 0]
+        leader = (state['dealer_actor'] + 1) % 4
+        num_tricks = min(len(cards) for cards in played)
+        # Completed tricks are the k-th cards of every player, led by the
+        # winner of the previous trick
+        for k in range(num_tricks):
+            trick = [((leader + i) % 4, played[(leader + i) % 4][k]) for i in range(4)]
+            lead = _suit_of(trick[0][1], trump)
+            for seat, card in trick[1:]:
+                if _suit_of(card, trump) != lead:
+                    voids[seat] |= FOLLOW_MASK[(trump, lead)]
+            strength = _STRENGTH[(trump, lead)]
+            leader = max(trick, key=lambda play: strength[play[1]])[0]
+        if state['center']:
+            lead = state['lead_suit']
+            for seat, card in list(zip(state['order'], state['center']))[1:]:
+                if _suit_of(CARD_INDEX[card.get_index()], trump) != lead:
+                    voids[seat] |= FOLLOW_MASK[(trump, lead)]
+        return voids
+
+    def close(self):
+        ''' Shut down the worker pool '''
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
@@ -24,7 +24,7 @@ class RandomAgent(object):
         Returns:
             action (int): The action predicted (randomly chosen) by the random agent
         '''
-        return np.random.choice(list(state['legal_actions'].keys()))
+        return np.random.choice(np.flatnonzero(state['legal_mask']))
 
     def eval_step(self, state):
         ''' Predict the action given the current state for evaluation.
@@ -37,11 +37,10 @@ class RandomAgent(object):
             action (int): The action predicted (randomly chosen) by the random agent
             probs (list): The list of action probabilities
         '''
-        probs = [0 for _ in range(self.num_actions)]
-        for i in state['legal_actions']:
-            probs[i] = 1/len(state['legal_actions'])
+        legal_mask = state['legal_mask']
+        probs = legal_mask / np.count_nonzero(legal_mask)
 
         info = {}
-        info['probs'] = {state['raw_legal_actions'][i]: probs[list(state['legal_actions'].keys())[i]] for i in range(len(state['legal_actions']))}
+        info['probs'] = {raw_action: float(probs[action_id]) for raw_action, action_id in zip(state['raw_legal_actions'], state['legal_actions'])}
 
         return self.step(state), info
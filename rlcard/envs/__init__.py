@@ -2,6 +2,7 @@
 '''
 from rlcard.envs.env import Env
 from rlcard.envs.registration import register, make
+from rlcard.envs.subproc_vec_env import SubprocVecEnv
 
 register(
     env_id='blackjack',
@@ -51,4 +52,9 @@ register(
 register(
     env_id='euchre',
     entry_point='rlcard.envs.euchre:EuchreEnv',
+)
+
+register(
+    env_id='euchre-vec',
+    entry_point='rlcard.envs.vec_euchre:VecEuchreEnv',
 )
\ No newline at end of file
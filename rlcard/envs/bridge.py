@@ -8,6 +8,7 @@ import numpy as np
 from collections import OrderedDict
 
 from rlcard.envs import Env
+from rlcard.utils import legal_mask
 
 from rlcard.games.bridge import Game
 
@@ -305,6 +306,7 @@ class DefaultBridgeStateExtractor(BridgeStateExtractor):
         obs = np.concatenate(rep)
         extracted_state['obs'] = obs
         extracted_state['legal_actions'] = legal_actions
+        extracted_state['legal_mask'] = legal_mask(legal_actions, ActionEvent.get_num_actions())
         extracted_state['raw_legal_actions'] = raw_legal_actions
         extracted_state['raw_obs'] = obs
         return extracted_state
@@ -168,6 +168,101 @@ class Env(object):
 
         return trajectories, payoffs
 
+    def run_arrays(self, is_training=False, buffer=None):
+        '''
+        Run a complete game like run, but write the transitions straight into
+        NumPy arrays instead of keeping the states.
+
+        Args:
+            is_training (boolean): True if for training purpose.
+            buffer (TrajectoryBuffer): Buffer to write into, reuse one across
+                games to avoid allocating. A new one is made if None.
+
+        Returns:
+            (tuple) Tuple containing:
+
+                (list): For each player, the dict of TrajectoryBuffer.get_transitions,
+                        views that are valid until the buffer is reused.
+                (list): A list payoffs. Each entry corresponds to one player.
+        '''
+        if buffer is None:
+            buffer = TrajectoryBuffer(self.num_players, self.num_actions)
+        buffer.clear()
+        state, player_id = self.reset()
+
+        # Loop to play the game
+        while not self.is_over():
+            agent = self.agents[player_id]
+            if not is_training:
+                action, _ = agent.eval_step(state)
+            else:
+                action = agent.step(state)
+            action_id = action
+            if agent.use_raw:
+                action_id = list(state['legal_actions'])[state['raw_legal_actions'].index(action)]
+            buffer.add(player_id, state, action_id)
+
+            # Environment steps
+            state, player_id = self.step(action, agent.use_raw)
+
+        # Payoffs
+        payoffs = self.get_payoffs()
+        for player_id in range(self.num_players):
+            buffer.finish(player_id, self.get_state(player_id), payoffs[player_id])
+
+        return [buffer.get_transitions(player_id) for player_id in range(self.num_players)], payoffs
+
+    def iter_transitions(self, is_training=True, num_episodes=None, player_ids=None):
+        '''
+        Play games and yield every transition as soon as it is complete,
+        without keeping whole trajectories.
+
+        A transition of a player is complete when the player acts again or
+        the game ends, so it holds the same data as reorganize produces.
+
+        Args:
+            is_training (boolean): True if for training purpose.
+            num_episodes (int): The number of games to play, endless if None.
+            player_ids (list): Only yield the transitions of these players,
+                all players if None.
+
+        Yields:
+            (tuple): The player id and the transition
+                (obs, action, reward, next_obs, legal_mask, done), where
+                legal_mask is the legal-action mask of next_obs.
+        '''
+        if player_ids is None:
+            player_ids = range(self.num_players)
+        recorded = [player_id in player_ids for player_id in range(self.num_players)]
+        episode = 0
+        while num_episodes is None or episode < num_episodes:
+            # The last decision of every player, waiting for its next state
+            pending = [None for _ in range(self.num_players)]
+            state, player_id = self.reset()
+            while not self.is_over():
+                if recorded[player_id] and pending[player_id] is not None:
+                    obs, action = pending[player_id]
+                    yield player_id, (obs, action, 0, state['obs'], state['legal_mask'], False)
+                agent = self.agents[player_id]
+                if not is_training:
+                    action, _ = agent.eval_step(state)
+                else:
+                    action = agent.step(state)
+                if recorded[player_id]:
+                    action_id = action
+                    if agent.use_raw:
+                        action_id = list(state['legal_actions'])[state['raw_legal_actions'].index(action)]
+                    pending[player_id] = (state['obs'], action_id)
+                state, player_id = self.step(action, agent.use_raw)
+
+            payoffs = self.get_payoffs()
+            for player_id in range(self.num_players):
+                if recorded[player_id] and pending[player_id] is not None:
+                    obs, action = pending[player_id]
+                    state = self.get_state(player_id)
+                    yield player_id, (obs, action, payoffs[player_id], state['obs'], state['legal_mask'], True)
+            episode += 1
+
     def is_over(self):
         ''' Check whether the curent game is over
 
@@ -1,40 +1,140 @@
 from rlcard.envs import Env
-from rlcard.games.euchre import Game
-from rlcard.games.euchre.utils import ACTION_SPACE, ACTION_LIST
-from collections import OrderedDict
+from rlcard.utils import LazyState
+from rlcard.games.euchre import Game, BitboardGame, Match
+from rlcard.games.euchre.game import EuchreGameState
+from rlcard.games.euchre.bitboard_game import BitboardState
+from rlcard.games.euchre.deal_bank import DealBank
+from rlcard.games.euchre.utils import ACTION_SPACE, ACTION_LIST, CARD_INDEX, BB_SUITS, mask2indices
+from rlcard.games.euchre.utils import OBS_HAND, OBS_FLIPPED, OBS_TURNED_DOWN, OBS_TRUMP, OBS_DEALER
+from rlcard.games.euchre.utils import OBS_CALLER, OBS_CENTER, OBS_PLAYED, OBS_DISCARD, OBS_SIZE
 import numpy as np
 
+ENGINES = {
+    'default': Game,
+    'bitboard': BitboardGame,
+}
+
+# Observation indices of every card for each part of the observation,
+# per relative seat where the part is split by seat
+_HAND_INDEX = {card: OBS_HAND + i for card, i in CARD_INDEX.items()}
+_FLIPPED_INDEX = {card: OBS_FLIPPED + i for card, i in CARD_INDEX.items()}
+_CENTER_INDEX = [{card: OBS_CENTER + 24 * seat + i for card, i in CARD_INDEX.items()} for seat in range(4)]
+_PLAYED_INDEX = [{card: OBS_PLAYED + 24 * seat + i for card, i in CARD_INDEX.items()} for seat in range(4)]
+_DISCARD_INDEX = {card: OBS_DISCARD + i for card, i in CARD_INDEX.items()}
+_TRUMP_INDEX = {suit: OBS_TRUMP + i for i, suit in enumerate(BB_SUITS)}
+_SEAT_ONE_HOT = np.eye(4, dtype=np.int8)
+
 class EuchreEnv(Env):
 
     def __init__(self, config):
-        self.game = Game(config=config)
+        # 'game_engine' selects the game core, see ENGINES
+        self.game = ENGINES[config.get('game_engine', 'default')](config=config)
+        # With 'match_points' an episode is a whole match instead of one hand
+        if config.get('match_points') is not None:
+            self.game = Match(config=config, game=self.game)
+        # With 'deal_bank' (a file from generate_deal_bank) every reset plays
+        # the next deal of the bank, from 'deal_index' and moved
+        # 'deal_rotation' seats to the left
+        self.deal_bank = None
+        if config.get('deal_bank') is not None:
+            if config.get('match_points') is not None:
+                raise ValueError('deal_bank can not be used with match_points')
+            self.deal_bank = DealBank(config['deal_bank'])
+            self.deal_index = config.get('deal_index', 0)
+            self.deal_rotation = config.get('deal_rotation', 0)
         self.name = "euchre"
 
         self.actions = ACTION_LIST
-        self.state_shape = [173]
         super().__init__(config)
-    
+        self.state_shape = [[OBS_SIZE] for _ in range(self.num_players)]
+        self.action_shape = [None for _ in range(self.num_players)]
+
+    def reset(self):
+        if self.deal_bank is not None:
+            deal = self.deal_bank.get_deal(self.deal_index % len(self.deal_bank), self.deal_rotation)
+            self.game.custom_deck, self.game.custom_dealer = deal
+            self.deal_index += 1
+        return super().reset()
+
+    def set_deal(self, index, rotation=None):
+        """Make the next reset play deal index of the deal bank.
+
+        Args:
+            index (int): Index of the deal
+            rotation (int): New seat rotation, unchanged if None
+        """
+        self.deal_index = index
+        if rotation is not None:
+            self.deal_rotation = rotation
 
     def _extract_state(self, state):
-        """Extract usable information from state."""
-
-        def vec(s):
-            """Encode list of cards s"""
-            # Return 'list' object
-            suit = {"C":[1,0,0,0], "D":[0,1,0,0], "H":[0,0,1,0], "S":[0,0,0,1]}
-            rank = {"9":9, "T":10, "J":11, "Q":12, "K":13, "A":14}
-            if len(s)==1:
-                return suit[s[0]]
-            temp_list = suit[s[0]]
-            temp_list.append(rank[s[1]])
-            return temp_list
-
-        state['legal_actions'] = self._get_legal_actions()
-        state['raw_legal_actions'] = self.game.get_legal_actions()
-
-        # TODO write obs
-        state['obs'] = []
-        return state
+        """Extract usable information from state.
+
+        The raw state keys stay readable on the returned LazyState, the
+        legal action dict and names are only built when read.
+        """
+        legal_ids = [ACTION_SPACE[action] for action in self.game.get_legal_actions()]
+
+        # States outlive the step (trajectories keep them), so every state
+        # gets its own array
+        obs = self._encode_state(state, np.zeros(OBS_SIZE, dtype=np.int8), clear=False)
+        return LazyState(obs, legal_ids, raw_obs=state, action_names=ACTION_LIST, flat=True)
+
+    def encode_states(self, states, out=None):
+        """Encode many raw states into one (len(states), OBS_SIZE) int8 array.
+
+        Args:
+            states (list): Raw states from the game's get_state
+            out (numpy.array): Optional array to write into, it is zeroed first
+
+        Returns:
+            (numpy.array): The observations, one row per state
+        """
+        if out is None:
+            out = np.zeros((len(states), OBS_SIZE), dtype=np.int8)
+        else:
+            out.fill(0)
+        for state, row in zip(states, out):
+            self._encode_state(state, row, clear=False)
+        return out
+
+    def _encode_state(self, state, out, clear=True):
+        """Write the observation of a raw state into the OBS_SIZE array out.
+
+        The layout is described next to OBS_SIZE in games/euchre/utils.py.
+        """
+        if clear:
+            out.fill(0)
+        me = state['player_id']
+        if isinstance(state, BitboardState):
+            # Read the card indices instead of making the card lists
+            indices = [OBS_HAND + card for card in mask2indices(state.hand_mask)]
+            for card, seat in zip(state.center_cards, state['order']):
+                indices.append(OBS_CENTER + 24 * ((seat - me) % 4) + card)
+            for seat, cards in enumerate(state.played_cards):
+                start = OBS_PLAYED + 24 * ((seat - me) % 4)
+                indices += [start + card for card in cards]
+        else:
+            if isinstance(state, EuchreGameState):
+                # Read the player's cards instead of making the hand list
+                indices = [_HAND_INDEX[card.get_index()] for card in state.hand_cards]
+            else:
+                indices = [_HAND_INDEX[card] for card in state['hand']]
+            for card, seat in zip(state['center'], state['order']):
+                indices.append(_CENTER_INDEX[(seat - me) % 4][card.get_index()])
+            for seat, cards in enumerate(state['played']):
+                played_index = _PLAYED_INDEX[(seat - me) % 4]
+                indices += [played_index[card] for card in cards]
+        indices.append(_FLIPPED_INDEX[state['flipped']])
+        if state['trump'] is not None:
+            indices.append(_TRUMP_INDEX[state['trump']])
+            out[OBS_CALLER:OBS_CALLER + 4] = self._orderShuffler(me, state['calling_actor'])
+        out[OBS_DEALER:OBS_DEALER + 4] = self._orderShuffler(me, state['dealer_actor'])
+        if state['discarded_card'] is not None and me == state['dealer_actor']:
+            indices.append(_DISCARD_INDEX[state['discarded_card']])
+        out[indices] = 1
+        out[OBS_TURNED_DOWN] = state['turned_down'] is not None
+        return out
 
     def _orderShuffler(self,curr_player_num, player_num):
             '''
@@ -58,18 +158,10 @@ class EuchreEnv(Env):
 
             Also, it's important to remember who was the dealer. As the dealer has an information advantage.
             '''
-            bin_encode = [0,0,0,0]
-            adjusted_num = (player_num - curr_player_num + 4) % 4
-            bin_encode[adjusted_num] = 1
-            return bin_encode
+            return _SEAT_ONE_HOT[(player_num - curr_player_num + 4) % 4]
 
     def _decode_action(self, action_id):
         return ACTION_LIST[action_id]
 
-    def _get_legal_actions(self):
-        legal_actions = self.game.get_legal_actions()
-        legal_ids = {ACTION_SPACE[action]: None for action in legal_actions}
-        return OrderedDict(legal_ids)
-
     def get_payoffs(self):
         return self.game.get_payoffs()
\ No newline at end of file
@@ -1,7 +1,6 @@
 import json
 import os
 import numpy as np
-from collections import OrderedDict
 
 import rlcard
 from rlcard.envs import Env
@@ -49,10 +48,7 @@ class LeducholdemEnv(Env):
         Returns:
             observation (list): combine the player's score and dealer's observable score for observation
         '''
-        extracted_state = {}
-
-        legal_actions = OrderedDict({self.actions.index(a): None for a in state['legal_actions']})
-        extracted_state['legal_actions'] = legal_actions
+        legal_ids = [self.actions.index(a) for a in state['legal_actions']]
 
         public_card = state['public_card']
         hand = state['hand']
@@ -62,13 +58,10 @@ class LeducholdemEnv(Env):
             obs[self.card2index[public_card]+3] = 1
         obs[state['my_chips']+6] = 1
         obs[sum(state['all_chips'])-state['my_chips']+21] = 1
-        extracted_state['obs'] = obs
-
-        extracted_state['raw_obs'] = state
-        extracted_state['raw_legal_actions'] = [a for a in state['legal_actions']]
-        extracted_state['action_record'] = self.action_recorder
 
-        return extracted_state
+        # The legal action dict and names are only built when read
+        return LazyState(obs, legal_ids, raw_obs=state, action_names=self.actions,
+                         action_record=self.action_recorder)
 
     def get_payoffs(self):
         ''' Get the payoff of a game
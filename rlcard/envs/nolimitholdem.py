@@ -5,6 +5,7 @@ from collections import OrderedDict
 
 import rlcard
 from rlcard.envs import Env
+from rlcard.utils import legal_mask
 from rlcard.games.nolimitholdem import Game
 from rlcard.games.nolimitholdem.round import Action
 
@@ -57,6 +58,7 @@ class NolimitholdemEnv(Env):
 
         legal_actions = OrderedDict({action.value: None for action in state['legal_actions']})
         extracted_state['legal_actions'] = legal_actions
+        extracted_state['legal_mask'] = legal_mask(legal_actions, self.num_actions)
 
         public_cards = state['public_cards']
         hand = state['hand']
@@ -0,0 +1,218 @@
+import ctypes
+import multiprocessing as mp
+import traceback
+
+import numpy as np
+
+from rlcard.envs.registration import make
+from rlcard.utils import seeding
+
+# Name, ctypes type and numpy dtype of every shared array
+_BUFFERS = [
+    ('obs', ctypes.c_float, np.float32),
+    ('legal_masks', ctypes.c_bool, np.bool_),
+    ('player_ids', ctypes.c_int64, np.int64),
+    ('dones', ctypes.c_bool, np.bool_),
+    ('payoffs', ctypes.c_float, np.float32),
+    ('actions', ctypes.c_int64, np.int64),
+]
+
+def _views(buffers, shapes):
+    ''' Numpy views of the shared arrays '''
+    return {name: np.frombuffer(buffers[name], dtype=dtype).reshape(shapes[name])
+            for name, _, dtype in _BUFFERS}
+
+def _worker(conn, env_id, config, seeds, start, buffers, shapes):
+    ''' Own the environments of rows start to start+len(seeds) and step them on command '''
+    envs = []
+    for seed in seeds:
+        env_config = dict(config)
+        env_config['seed'] = seed
+        envs.append(make(env_id, env_config))
+    arrays = _views(buffers, shapes)
+    obs, legal_masks, player_ids = arrays['obs'], arrays['legal_masks'], arrays['player_ids']
+    dones, payoffs, actions = arrays['dones'], arrays['payoffs'], arrays['actions']
+
+    def write(row, env, state, player_id):
+        obs[row] = np.reshape(state['obs'], -1)
+        legal_masks[row] = state['legal_mask']
+        player_ids[row] = player_id
+        if env.is_over():
+            dones[row] = True
+            # Some games return a dict keyed by player id
+            payoff = env.get_payoffs()
+            payoffs[row] = [payoff[i] for i in range(env.num_players)]
+
+    while True:
+        cmd, data = conn.recv()
+        if cmd == 'close':
+            break
+        try:
+            if cmd == 'reset':
+                for row in data:
+                    env = envs[row - start]
+                    dones[row] = False
+                    payoffs[row] = 0
+                    state, player_id = env.reset()
+                    write(row, env, state, player_id)
+            elif cmd == 'step':
+                for i, env in enumerate(envs):
+                    row = start + i
+                    if not dones[row]:
+                        state, player_id = env.step(int(actions[row]))
+                        write(row, env, state, player_id)
+            conn.send(None)
+        except Exception:
+            conn.send(traceback.format_exc())
+    conn.close()
+
+class SubprocVecEnv(object):
+    ''' Steps many copies of an environment in worker processes.
+
+    Each of the num_workers processes owns envs_per_worker environments and
+    writes their observations, legal-action masks, current players, done
+    flags and payoffs into arrays in shared memory, so the parent gets
+    stacked (num_envs, ...) arrays without pickling any state. Only the
+    commands go through pipes. The interface follows VecEuchreEnv: finished
+    environments ignore their actions until they are reset.
+    '''
+
+    def __init__(self, env_id, num_workers, envs_per_worker=1, config=None, seed=None, start_method=None):
+        ''' Start the workers
+
+        Args:
+            env_id (str): The registered environment to run
+            num_workers (int): The number of worker processes
+            envs_per_worker (int): The number of environments of each worker
+            config (dict): The config passed to rlcard.make
+            seed (int): Root seed, every environment gets its own stream
+                from seeding.spawn_seeds. Defaults to config['seed']
+            start_method (str): The multiprocessing start method, the
+                platform default if None
+        '''
+        config = {} if config is None else dict(config)
+        if seed is None:
+            seed = config.get('seed')
+        self.num_workers = num_workers
+        self.envs_per_worker = envs_per_worker
+        self.num_envs = num_workers * envs_per_worker
+
+        env = make(env_id, config)
+        self.num_players = env.num_players
+        self.num_actions = env.num_actions
+        self.state_shape = env.state_shape
+        self.action_shape = env.action_shape
+        obs_size = int(np.prod(env.state_shape[0]))
+
+        shapes = {
+            'obs': (self.num_envs, obs_size),
+            'legal_masks': (self.num_envs, self.num_actions),
+            'player_ids': (self.num_envs,),
+            'dones': (self.num_envs,),
+            'payoffs': (self.num_envs, self.num_players),
+            'actions': (self.num_envs,),
+        }
+        ctx = mp.get_context(start_method)
+        buffers = {name: ctx.RawArray(ctype, int(np.prod(shapes[name]))) for name, ctype, _ in _BUFFERS}
+        self._arrays = _views(buffers, shapes)
+        self._arrays['dones'][:] = True
+
+        seeds = seeding.spawn_seeds(seed, self.num_envs)
+        self._conns = []
+        self._processes = []
+        for k in range(num_workers):
+            start = k * envs_per_worker
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(target=_worker, daemon=True,
+                                  args=(child_conn, env_id, config, seeds[start:start + envs_per_worker],
+                                        start, buffers, shapes))
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+        self.closed = False
+
+    def reset(self, indices=None):
+        ''' Start new games
+
+        Args:
+            indices (numpy.array): Indices or boolean mask of the environments
+                to restart, all of them if None
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): (num_envs, obs_size) float32 observations
+                (numpy.array): (num_envs, num_actions) legal-action masks
+                (numpy.array): (num_envs,) current player ids
+        '''
+        if indices is None:
+            rows = np.arange(self.num_envs)
+        else:
+            indices = np.asarray(indices)
+            rows = np.flatnonzero(indices) if indices.dtype == np.bool_ else indices
+        worker_ids = rows // self.envs_per_worker
+        self._command([('reset', rows[worker_ids == k].tolist()) for k in range(self.num_workers)])
+        arrays = self._arrays
+        return arrays['obs'], arrays['legal_masks'], arrays['player_ids']
+
+    def step(self, actions):
+        ''' Step every unfinished environment forward
+
+        Args:
+            actions (numpy.array): (num_envs,) action ids, ignored for
+                finished environments
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): (num_envs, obs_size) float32 observations
+                (numpy.array): (num_envs, num_actions) legal-action masks
+                (numpy.array): (num_envs,) current player ids
+                (numpy.array): (num_envs,) True where the game is over
+
+        Note: The arrays are views of the shared memory, the next call to
+              step or reset overwrites them. Copy them to keep them.
+        '''
+        arrays = self._arrays
+        arrays['actions'][:] = actions
+        self._command([('step', None) for _ in range(self.num_workers)])
+        return arrays['obs'], arrays['legal_masks'], arrays['player_ids'], arrays['dones']
+
+    def get_legal_mask(self):
+        return self._arrays['legal_masks']
+
+    def get_player_id(self):
+        return self._arrays['player_ids']
+
+    def is_over(self):
+        return self._arrays['dones']
+
+    def get_payoffs(self):
+        ''' Payoffs of finished games
+
+        Returns:
+            (numpy.array): (num_envs, num_players) payoffs, zero for games still in play
+        '''
+        return self._arrays['payoffs']
+
+    def close(self):
+        ''' Stop the workers '''
+        if self.closed:
+            return
+        for conn in self._conns:
+            conn.send(('close', None))
+        for process in self._processes:
+            process.join()
+        for conn in self._conns:
+            conn.close()
+        self.closed = True
+
+    def _command(self, commands):
+        ''' Send one command to every worker and wait for all of them '''
+        for conn, command in zip(self._conns, commands):
+            conn.send(command)
+        errors = [conn.recv() for conn in self._conns]
+        for error in errors:
+            if error is not None:
+                raise RuntimeError('Error in a SubprocVecEnv worker:\n' + error)
@@ -0,0 +1,102 @@
+import numpy as np
+
+from rlcard.games.euchre import BatchGame
+from rlcard.games.euchre.utils import ACTION_LIST, OBS_SIZE
+from rlcard.utils import seeding
+
+class VecEuchreEnv(object):
+    ''' Euchre environment that steps 'num_envs' deals in lockstep.
+
+    Instead of state dictionaries it returns stacked arrays: observations of
+    shape (num_envs, OBS_SIZE) and legal-action masks of shape
+    (num_envs, 54), both for the current player of each deal, so a single
+    batched network call can act for every table.
+    '''
+
+    def __init__(self, config):
+        ''' Initialize the environment
+
+        Args:
+            config (dict): 'num_envs' (int) is the number of deals played in
+                lockstep, 'seed' (int) the random seed.
+        '''
+        self.name = 'euchre'
+        self.num_envs = config.get('num_envs', 1)
+        self.game = BatchGame(self.num_envs)
+        self.actions = ACTION_LIST
+        self.num_players = self.game.get_num_players()
+        self.num_actions = self.game.get_num_actions()
+        self.state_shape = [[OBS_SIZE] for _ in range(self.num_players)]
+        self.action_shape = [None for _ in range(self.num_players)]
+        self.timestep = 0
+        self.seed(config.get('seed'))
+
+    def reset(self, indices=None):
+        ''' Start new deals
+
+        Args:
+            indices (numpy.array): Indices or boolean mask of the deals to
+                restart, all of them if None
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): (num_envs, OBS_SIZE) observations
+                (numpy.array): (num_envs, 54) legal-action masks
+                (numpy.array): (num_envs,) current player ids
+        '''
+        self.game.init_game(indices)
+        return self.game.get_obs(), self.game.get_legal_mask(), self.game.current_player.copy()
+
+    def step(self, actions):
+        ''' Step every unfinished deal forward
+
+        Args:
+            actions (numpy.array): (num_envs,) action ids, ignored for finished deals
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): (num_envs, OBS_SIZE) observations
+                (numpy.array): (num_envs, 54) legal-action masks
+                (numpy.array): (num_envs,) current player ids
+                (numpy.array): (num_envs,) True where the deal is over
+        '''
+        self.timestep += int(np.count_nonzero(~self.game.over))
+        self.game.step(actions)
+        return self.game.get_obs(), self.game.get_legal_mask(), \
+            self.game.current_player.copy(), self.game.over.copy()
+
+    def get_state(self, player_ids):
+        ''' Observations of the given player in every deal
+
+        Args:
+            player_ids (numpy.array or int): (num_envs,) observing players
+
+        Returns:
+            (numpy.array): (num_envs, OBS_SIZE) observations
+        '''
+        player_ids = np.broadcast_to(np.asarray(player_ids, dtype=int), (self.num_envs,))
+        return self.game.get_obs(player_ids)
+
+    def get_legal_mask(self):
+        return self.game.get_legal_mask()
+
+    def get_player_id(self):
+        return self.game.current_player.copy()
+
+    def is_over(self):
+        return self.game.over.copy()
+
+    def get_payoffs(self):
+        ''' Payoffs of finished deals
+
+        Returns:
+            (numpy.array): (num_envs, 4) payoffs, zero for deals still in play
+        '''
+        return self.game.payoffs.astype(np.float32)
+
+    def seed(self, seed=None):
+        self.np_random, seed = seeding.np_random(seed)
+        self.game.np_random = self.np_random
+        return seed
@@ -1,4 +1,7 @@
 from rlcard.games.euchre.dealer import EuchreDealer as Dealer
 from rlcard.games.euchre.judger import EuchreJudger as Judger
 from rlcard.games.euchre.player import EuchrePlayer as Player
-from rlcard.games.euchre.game import EuchreGame as Game
\ No newline at end of file
+from rlcard.games.euchre.game import EuchreGame as Game
+from rlcard.games.euchre.bitboard_game import EuchreBitboardGame as BitboardGame
+from rlcard.games.euchre.batch_game import BatchEuchreGame as BatchGame
+from rlcard.games.euchre.match import EuchreMatch as Match
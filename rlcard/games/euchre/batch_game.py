@@ -0,0 +1,220 @@
+import numpy as np
+
+from rlcard.games.euchre.utils import BB_SUITS, CARD_LIST, CARD_SUIT, TRUMP_MASK, FOLLOW_MASK
+from rlcard.games.euchre.utils import OBS_HAND, OBS_FLIPPED, OBS_TURNED_DOWN, OBS_TRUMP, OBS_DEALER
+from rlcard.games.euchre.utils import OBS_CALLER, OBS_CENTER, OBS_PLAYED, OBS_DISCARD, OBS_SIZE
+from rlcard.games.euchre.judger import TRICK_STRENGTH
+
+def _mask2array(mask):
+    return np.array([mask >> i & 1 for i in range(len(CARD_LIST))], dtype=bool)
+
+# Per-card tables indexed with bitboard card indices and BB_SUITS suit indices
+SUIT_INDEX = np.array([BB_SUITS.index(suit) for suit in CARD_SUIT], dtype=int)
+TRUMP_CARDS = np.array([_mask2array(TRUMP_MASK[trump]) for trump in BB_SUITS])
+FOLLOW_CARDS = np.array([[_mask2array(FOLLOW_MASK[(trump, lead)]) for lead in BB_SUITS] for trump in BB_SUITS])
+
+class BatchEuchreGame(object):
+    ''' Plays N independent Euchre deals in lockstep.
+
+    The state of every deal lives in NumPy arrays with the deal as the first
+    axis. Suits are indices into BB_SUITS, cards are bitboard indices and
+    actions are the ids of ACTION_SPACE. A trump or lead suit of -1 means it
+    is not set yet.
+    '''
+
+    def __init__(self, num_games):
+        self.num_games = num_games
+        self.num_players = 4
+        self.np_random = np.random.RandomState()
+
+        n = num_games
+        self.hands = np.zeros((n, 4, len(CARD_LIST)), dtype=bool)
+        self.played = np.zeros((n, 4, len(CARD_LIST)), dtype=bool)
+        self.center = np.full((n, 4), -1, dtype=int)
+        self.tricks = np.zeros((n, 4), dtype=int)
+        self.payoffs = np.zeros((n, 4), dtype=int)
+        self.dealer = np.zeros(n, dtype=int)
+        self.current_player = np.zeros(n, dtype=int)
+        self.calling_player = np.full(n, -1, dtype=int)
+        self.flipped = np.zeros(n, dtype=int)
+        self.trump = np.full(n, -1, dtype=int)
+        self.lead_suit = np.full(n, -1, dtype=int)
+        self.discarded = np.full(n, -1, dtype=int)
+        self.num_center = np.zeros(n, dtype=int)
+        self.num_tricks = np.zeros(n, dtype=int)
+        self.turned_down = np.zeros(n, dtype=bool)
+        self.discarding = np.zeros(n, dtype=bool)
+        self.over = np.zeros(n, dtype=bool)
+        self._arange = np.arange(n)
+
+    def init_game(self, indices=None):
+        ''' Deal new hands
+
+        Args:
+            indices (numpy.array): Indices or boolean mask of the deals to
+                restart, all of them if None
+        '''
+        if indices is None:
+            indices = self._arange
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        n = len(indices)
+        decks = np.argsort(self.np_random.random_sample((n, len(CARD_LIST))), axis=1)
+        dealer = self.np_random.randint(0, self.num_players, n)
+
+        # Deal in order of left, across, right, dealer
+        seats = (dealer[:, np.newaxis] + 1 + np.arange(20) // 5) % 4
+        self.hands[indices] = False
+        self.hands[indices[:, np.newaxis], seats, decks[:, :20]] = True
+        self.played[indices] = False
+        self.center[indices] = -1
+        self.tricks[indices] = 0
+        self.payoffs[indices] = 0
+        self.dealer[indices] = dealer
+        self.current_player[indices] = (dealer + 1) % 4
+        self.calling_player[indices] = -1
+        self.flipped[indices] = decks[:, 20]
+        self.trump[indices] = -1
+        self.lead_suit[indices] = -1
+        self.discarded[indices] = -1
+        self.num_center[indices] = 0
+        self.num_tricks[indices] = 0
+        self.turned_down[indices] = False
+        self.discarding[indices] = False
+        self.over[indices] = False
+
+    def step(self, actions):
+        ''' Apply one action in every deal that is not over
+
+        Args:
+            actions (numpy.array): (N,) legal action ids, ignored for finished deals
+        '''
+        actions = np.asarray(actions)
+        live = ~self.over
+        current = self.current_player
+
+        g = np.flatnonzero(live & (actions == 0))  # pass
+        self.turned_down[g] |= current[g] == self.dealer[g]
+        current[g] = (current[g] + 1) % 4
+
+        g = np.flatnonzero(live & (actions == 1))  # pick
+        self.hands[g, self.dealer[g], self.flipped[g]] = True
+        self.trump[g] = SUIT_INDEX[self.flipped[g]]
+        self.calling_player[g] = current[g]
+        self.discarding[g] = True
+        current[g] = self.dealer[g]
+
+        g = np.flatnonzero(live & (actions >= 2) & (actions < 6))  # call
+        self.trump[g] = actions[g] - 2
+        self.calling_player[g] = current[g]
+        current[g] = (self.dealer[g] + 1) % 4
+
+        g = np.flatnonzero(live & (actions >= 30))  # discard
+        self.hands[g, current[g], actions[g] - 30] = False
+        self.discarded[g] = actions[g] - 30
+        self.discarding[g] = False
+        current[g] = (current[g] + 1) % 4
+
+        g = np.flatnonzero(live & (actions >= 6) & (actions < 30))  # play
+        if len(g):
+            self._play_cards(g, actions[g] - 6)
+
+    def _play_cards(self, g, cards):
+        seat = self.current_player[g]
+        self.hands[g, seat, cards] = False
+        self.played[g, seat, cards] = True
+        self.center[g, seat] = cards
+        leading = self.num_center[g] == 0
+        lead_suit = np.where(TRUMP_CARDS[self.trump[g], cards], self.trump[g], SUIT_INDEX[cards])
+        self.lead_suit[g[leading]] = lead_suit[leading]
+        self.num_center[g] += 1
+        self.current_player[g] = (seat + 1) % 4
+
+        g = g[self.num_center[g] == 4]
+        if len(g) == 0:
+            return
+        strength = TRICK_STRENGTH[self.trump[g, np.newaxis], self.lead_suit[g, np.newaxis], self.center[g]]
+        winner = strength.argmax(axis=1)
+        self.tricks[g, winner] += 1
+        self.current_player[g] = winner
+        self.center[g] = -1
+        self.num_center[g] = 0
+        self.lead_suit[g] = -1
+        self.num_tricks[g] += 1
+
+        g = g[self.num_tricks[g] == 5]
+        self.over[g] = True
+        team_1_score = self.tricks[g, 0] + self.tricks[g, 2]
+        points = np.where((team_1_score == 5) | (team_1_score == 0), 2, 1)
+        points = np.where(team_1_score >= 3, points, -points)
+        self.payoffs[g] = points[:, np.newaxis] * np.array([1, -1, 1, -1])
+
+    def get_legal_mask(self):
+        ''' Legal actions of the current player of every deal
+
+        Returns:
+            (numpy.array): (N, 54) boolean mask, all False for finished deals
+        '''
+        mask = np.zeros((self.num_games, 54), dtype=bool)
+        g = self._arange
+        hand = self.hands[g, self.current_player]
+        bidding = self.trump < 0
+
+        first = bidding & ~self.turned_down
+        mask[first, :2] = True
+
+        second = np.flatnonzero(bidding & self.turned_down)
+        mask[second, 2:6] = True
+        mask[second, 2 + SUIT_INDEX[self.flipped[second]]] = False
+        mask[second, 0] = self.current_player[second] != self.dealer[second]
+
+        mask[self.discarding, 30:] = hand[self.discarding]
+
+        playing = ~bidding & ~self.discarding & ~self.over
+        follow = hand & FOLLOW_CARDS[self.trump, self.lead_suit]
+        must_follow = (self.lead_suit >= 0) & follow.any(axis=1)
+        cards = np.where(must_follow[:, np.newaxis], follow, hand)
+        mask[playing, 6:30] = cards[playing]
+        return mask
+
+    def get_obs(self, player_ids=None):
+        ''' Encode every deal from the point of view of one player
+
+        Args:
+            player_ids (numpy.array): (N,) observing player of each deal,
+                the current players if None
+
+        Returns:
+            (numpy.array): (N, OBS_SIZE) int8 observations
+        '''
+        if player_ids is None:
+            player_ids = self.current_player
+        g = self._arange
+        obs = np.zeros((self.num_games, OBS_SIZE), dtype=np.int8)
+        # Seats in relative order self, left, partner, right
+        seats = (player_ids[:, np.newaxis] + np.arange(4)) % 4
+
+        obs[:, OBS_HAND:OBS_HAND + 24] = self.hands[g, player_ids]
+        obs[g, OBS_FLIPPED + self.flipped] = 1
+        obs[:, OBS_TURNED_DOWN] = self.turned_down
+        called = np.flatnonzero(self.trump >= 0)
+        obs[called, OBS_TRUMP + self.trump[called]] = 1
+        obs[called, OBS_CALLER + (self.calling_player[called] - player_ids[called]) % 4] = 1
+        obs[g, OBS_DEALER + (self.dealer - player_ids) % 4] = 1
+
+        center = self.center[g[:, np.newaxis], seats]
+        rows, rel = np.nonzero(center >= 0)
+        obs[rows, OBS_CENTER + 24 * rel + center[rows, rel]] = 1
+        obs[:, OBS_PLAYED:OBS_PLAYED + 96] = self.played[g[:, np.newaxis], seats].reshape(self.num_games, 96)
+
+        seen = np.flatnonzero((self.discarded >= 0) & (player_ids == self.dealer))
+        obs[seen, OBS_DISCARD + self.discarded[seen]] = 1
+        return obs
+
+    def get_num_players(self):
+        return self.num_players
+
+    @staticmethod
+    def get_num_actions():
+        return 54
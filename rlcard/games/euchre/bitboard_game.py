@@ -0,0 +1,310 @@
+from rlcard.games.euchre.utils import init_euchre_deck, mask2list, lowest_card, ACTION_SPACE
+from rlcard.games.euchre.utils import CARD_LIST, CARD_INDEX, CARD_OBJECTS, CARD_SUIT
+from rlcard.games.euchre.utils import RIGHT_BIT, LEFT_BIT, TRUMP_MASK, FOLLOW_MASK
+
+from rlcard.games.euchre import Judger
+
+from rlcard.games.euchre.state import EuchreState, UNMADE
+
+import numpy as np
+
+class BitboardState(EuchreState):
+    ''' State dictionary of EuchreBitboardGame
+
+    The card lists 'hand', 'center' and 'played' are kept as the hand mask
+    and the card indices of the game (hand_mask, center_cards and
+    played_cards, each seat's cards in play order) and only made when they
+    are read, since EuchreEnv encodes the observation from the indices.
+    '''
+    __slots__ = ('hand_mask', 'center_cards', 'played_cards')
+
+    def __init__(self, items, hand_mask, center_cards, played_cards):
+        super().__init__(items)
+        self.hand_mask = hand_mask
+        self.center_cards = center_cards
+        self.played_cards = played_cards
+
+    def _make(self, key):
+        if key == 'hand':
+            return mask2list(self.hand_mask)
+        if key == 'center':
+            return [CARD_OBJECTS[card] for card in self.center_cards]
+        return [[CARD_LIST[card] for card in cards] for cards in self.played_cards]
+
+class EuchreBitboardGame(object):
+    ''' Euchre engine that keeps hands, the trick center and played cards as
+    24-bit integer masks (see the bitboard layout in euchre/utils.py).
+
+    It exposes the same interface and state dictionary as EuchreGame, so
+    EuchreEnv can switch engines with the 'game_engine' config.
+    '''
+
+    def __init__(self, allow_step_back=False, config=None):
+        self.allow_step_back = allow_step_back
+        self.num_players = 4
+        self.payoffs = [0 for _ in range(self.num_players)]
+
+        self.custom_deck = config.get('custom_deck')
+        self.custom_dealer = config.get('custom_dealer_id')
+        # Replaced by the env's generator when the env is seeded
+        self.np_random = np.random.RandomState()
+
+        self.judge = Judger()
+        # Containers are allocated once and cleared by init_game
+        self._deck = list(range(len(CARD_LIST)))
+        self.hands = [0 for _ in range(self.num_players)]
+        self.history = []
+        self.score = {i:0 for i in range(self.num_players)}
+
+    def init_game(self):
+        self.payoffs = [0 for _ in range(self.num_players)]
+
+        if self.custom_deck is None:
+            # Start from the fixed order, so the deal only depends on the generator
+            deck = self._deck
+            deck[:] = range(len(CARD_LIST))
+            self.np_random.shuffle(deck)
+        else:
+            deck = [CARD_INDEX[card.get_index()] for card in init_euchre_deck(self.custom_deck, self.np_random)]
+        self.deck = deck
+        if self.custom_dealer is None:
+            self.dealer_player_id = self.np_random.randint(0, self.num_players)
+        else:
+            self.dealer_player_id = self.custom_dealer
+
+        # Deal in order of left, across, right, dealer
+        for i in range(self.num_players):
+            mask = 0
+            for card in deck[5 * i:5 * i + 5]:
+                mask |= 1 << card
+            self.hands[(i + 1 + self.dealer_player_id) % 4] = mask
+
+        self.flipped = deck[20]
+        self.calling_player = -1
+        # Options: {Avaliable=0,TurnedDown=1,PickedUp=2}
+        # New per hand, states of earlier hands keep referencing their own
+        self.flipped_choice = np.zeros(2)
+        self.history.clear()
+        self.center_cards = []
+        self.center_mask = 0
+        self.order = []
+        for i in self.score:
+            self.score[i] = 0
+        self.game_over = False
+
+        self.trump = None
+        self.lead_suit = None
+        self.turned_down = None
+        self.discarded_card = None
+        # Card indices played by each seat, in play order
+        self.played = [[] for _ in range(self.num_players)]
+
+        self.current_player = self._increment_player(self.dealer_player_id)
+        state = self.get_state(self.current_player)
+        return state, self.current_player
+
+    def get_deal(self):
+        ''' The deck and dealer of the current hand, in the format of the
+            'custom_deck' and 'custom_dealer_id' configs, to replay it '''
+        return [CARD_LIST[card] for card in self.deck], self.dealer_player_id
+
+    @property
+    def flipped_card(self):
+        return CARD_OBJECTS[self.flipped]
+
+    @property
+    def center(self):
+        return [CARD_OBJECTS[card] for card in self.center_cards]
+
+    def get_state(self, player_id):
+        items = {
+            'hand': UNMADE,
+            'trump_called': self.trump is not None,
+            # Important to remember at each state who called trump
+            'calling_actor': self.calling_player,
+            'dealer_actor': self.dealer_player_id,
+            'trump': self.trump,
+            'turned_down': self.turned_down,
+            'lead_suit': self.lead_suit,
+            'flipped': CARD_LIST[self.flipped],
+            'flipped_choice': self.flipped_choice,
+            'discarded_card': self.discarded_card,
+            'center': UNMADE,
+            'order': self.order,
+            'played': UNMADE,
+            'current_actor': self.current_player,
+            'player_id': player_id,
+        }
+        played = tuple(tuple(cards) for cards in self.played)
+        return BitboardState(items, self.hands[player_id], tuple(self.center_cards), played)
+
+    def step(self, action):
+        if self.allow_step_back:
+            self._add_to_history(action)
+
+        if action == 'pick':
+            self._perform_pick_action()
+
+        elif action == 'pass':
+            self._perform_pass()
+
+        elif action.startswith('call'):
+            self._perform_call(action[5])
+
+        elif action.startswith('discard'):
+            self._perform_discard(CARD_INDEX[action[8:]])
+
+        else:
+            self._play_card(CARD_INDEX[action])
+
+            if len(self.center_cards) == 4:
+                self._end_trick()
+                if self.hands[self.current_player] == 0:
+                    self.winner, self.points = self.judge.judge_hand(self)
+                    self.game_over = True
+
+        state = self.get_state(self.current_player)
+        return state, self.current_player
+
+    def _perform_pick_action(self):
+        self.hands[self.dealer_player_id] |= 1 << self.flipped
+        self.trump = CARD_SUIT[self.flipped]
+        self.flipped_choice[1] = 1
+        self.calling_player = self.current_player
+        self.current_player = self.dealer_player_id
+
+    def _increment_player(self, player_id):
+        return (player_id + 1) % self.num_players
+
+    def _perform_discard(self, card):
+        self.hands[self.current_player] &= ~(1 << card)
+        self.discarded_card = CARD_LIST[card]
+        self.current_player = self._increment_player(self.current_player)
+
+    def _play_card(self, card):
+        bit = 1 << card
+        self.hands[self.current_player] &= ~bit
+        if not self.center_cards:
+            self.lead_suit = self.trump if bit & TRUMP_MASK[self.trump] else CARD_SUIT[card]
+        self.center_cards.append(card)
+        self.center_mask |= bit
+        self.played[self.current_player].append(card)
+        self.order.append(self.current_player)
+        self.current_player = self._increment_player(self.current_player)
+
+    def _judge_trick(self):
+        ''' Return the winning card of the trick in the center '''
+        trumps = self.center_mask & TRUMP_MASK[self.trump]
+        if trumps:
+            if trumps & RIGHT_BIT[self.trump]:
+                return lowest_card(RIGHT_BIT[self.trump])
+            if trumps & LEFT_BIT[self.trump]:
+                return lowest_card(LEFT_BIT[self.trump])
+            return lowest_card(trumps)
+        return lowest_card(self.center_mask & FOLLOW_MASK[(self.trump, self.lead_suit)])
+
+    def _end_trick(self):
+        winner = self.order[self.center_cards.index(self._judge_trick())]
+        self.score[winner] += 1
+        self.current_player = winner
+        self.center_cards = []
+        self.center_mask = 0
+        self.order = []
+        self.lead_suit = None
+
+    def _perform_call(self, suit):
+        self.trump = suit
+        self.calling_player = self.current_player
+        self.current_player = self._increment_player(self.dealer_player_id)
+
+    def _perform_pass(self):
+        if self.current_player == self.dealer_player_id:
+            self.turned_down = CARD_SUIT[self.flipped]
+            self.flipped_choice[0] = 1
+        self.current_player = self._increment_player(self.current_player)
+
+    def get_legal_card_mask(self):
+        ''' Mask of the cards the current player may play '''
+        hand = self.hands[self.current_player]
+        if self.lead_suit is None:
+            return hand
+        return hand & FOLLOW_MASK[(self.trump, self.lead_suit)] or hand
+
+    def get_legal_actions(self):
+        hand = self.hands[self.current_player]
+        if self.trump is not None and bin(hand).count('1') == 6:
+            return ['discard-' + card for card in mask2list(hand)]
+
+        if self.trump is None:
+            if self.turned_down is None:
+                return ['pick', 'pass']
+            else:
+                actions = [f"call-{suit}" for suit in ['S', 'C', 'D', 'H'] if suit != self.turned_down]
+                if self.current_player != self.dealer_player_id:
+                    actions += ['pass']
+                return actions
+
+        return mask2list(self.get_legal_card_mask())
+
+    def get_num_players(self):
+        return self.num_players
+
+    def get_payoffs(self):
+        payoffs = {}
+
+        for i in range(self.num_players):
+            if i in self.winner:
+                payoffs[i] = self.points
+            else:
+                payoffs[i] = -self.points
+
+        return payoffs
+
+    def is_over(self):
+        return self.game_over
+
+    def get_player_id(self):
+        return self.current_player
+
+    def _add_to_history(self, action):
+        ''' Push an undo record for action, which is about to be applied.
+
+        Only scalars are saved. The center lists are kept by reference: a
+        trick end replaces them instead of clearing them.
+        '''
+        self.history.append((action, self.current_player, self.trump, self.lead_suit, self.turned_down,
+                             self.calling_player, self.discarded_card, tuple(self.flipped_choice),
+                             self.center_cards, self.center_mask, self.order))
+
+    def step_back(self):
+        ''' Undo the last action
+
+        Returns:
+            (bool): True if the game steps back successfully
+        '''
+        if not self.history:
+            return False
+        action, current_player, self.trump, self.lead_suit, self.turned_down, self.calling_player, \
+            self.discarded_card, flipped_choice, self.center_cards, self.center_mask, self.order = self.history.pop()
+        self.flipped_choice[:] = flipped_choice
+        self.game_over = False
+
+        if action == 'pick':
+            self.hands[self.dealer_player_id] &= ~(1 << self.flipped)
+        elif action.startswith('discard'):
+            self.hands[current_player] |= 1 << CARD_INDEX[action[8:]]
+        elif action[0] in 'HDSC':
+            bit = 1 << CARD_INDEX[action]
+            if len(self.center_cards) == 4:
+                # The play ended the trick, and the trick winner leads next
+                self.score[self.current_player] -= 1
+            self.hands[current_player] |= bit
+            self.played[current_player].pop()
+            self.center_cards.pop()
+            self.order.pop()
+        self.current_player = current_player
+        return True
+
+    @staticmethod
+    def get_num_actions():
+        return len(ACTION_SPACE)
@@ -0,0 +1,145 @@
+''' Suit-isomorphism canonicalization of Euchre states
+
+Relabeling the suits does not change a Euchre deal as long as the two
+suits of each color stay paired, since the left bower is the jack of the
+same color as trump (see LEFT in euchre/utils.py). There are 8 such
+relabelings. canonicalize picks the one that gives the smallest key, so all
+equivalent states share a key, and the action maps translate actions
+between the real and the canonical suits.
+
+Permutations are indices into SUIT_PERMUTATIONS. Cards are bitboard
+indices, whose 6-bit suit blocks share the same rank order, so a
+relabeling moves whole blocks.
+'''
+from collections import OrderedDict
+from itertools import permutations
+import numpy as np
+
+from rlcard.games.euchre.utils import LEFT, ACTION_SPACE, ACTION_LIST, BB_SUITS, CARD_INDEX, CARD_LIST, CARD_OBJECTS
+
+_PARTNER = [BB_SUITS.index(LEFT[suit][0]) for suit in BB_SUITS]
+
+# SUIT_PERMUTATIONS[k][s] is the new BB_SUITS index of suit s
+SUIT_PERMUTATIONS = [list(p) for p in permutations(range(len(BB_SUITS)))
+                     if all(_PARTNER[p[s]] == p[_PARTNER[s]] for s in range(len(BB_SUITS)))]
+INVERSE_PERMUTATIONS = [SUIT_PERMUTATIONS.index([p.index(s) for s in range(len(BB_SUITS))])
+                        for p in SUIT_PERMUTATIONS]
+SUIT_MAPS = [{suit: BB_SUITS[p[s]] for s, suit in enumerate(BB_SUITS)} for p in SUIT_PERMUTATIONS]
+# CARD_PERMUTATIONS[k][c] is the new bitboard index of card c
+CARD_PERMUTATIONS = [[6 * p[c // 6] + c % 6 for c in range(len(CARD_LIST))] for p in SUIT_PERMUTATIONS]
+
+def _permute_action(action, suits):
+    if action.startswith('call'):
+        return 'call-' + suits[action[5]]
+    if action.startswith('discard'):
+        return 'discard-' + suits[action[8]] + action[9]
+    if action in ('pass', 'pick'):
+        return action
+    return suits[action[0]] + action[1]
+
+# ACTION_PERMUTATIONS[k][a] is the id of action a after relabeling k
+ACTION_PERMUTATIONS = [[ACTION_SPACE[_permute_action(action, suits)] for action in ACTION_LIST]
+                       for suits in SUIT_MAPS]
+
+def permute_mask(mask, k):
+    ''' Relabel the suits of a 24-bit card mask '''
+    p = SUIT_PERMUTATIONS[k]
+    return (mask & 63) << 6 * p[0] | (mask >> 6 & 63) << 6 * p[1] \
+        | (mask >> 12 & 63) << 6 * p[2] | (mask >> 18 & 63) << 6 * p[3]
+
+def canonicalize(state):
+    ''' Find the canonical suit relabeling of a state
+
+    Args:
+        state (dict): A raw Euchre state from the game's get_state
+
+    Returns:
+        (tuple): Tuple containing:
+
+            (tuple): Hashable key shared by all states equal up to relabeling
+            (int): The permutation k that maps the state to its canonical form
+    '''
+    me = state['player_id']
+    dealer = state['dealer_actor']
+    hand = 0
+    for card in state['hand']:
+        hand |= 1 << CARD_INDEX[card]
+    flipped = CARD_INDEX[state['flipped']]
+    trump = -1 if state['trump'] is None else BB_SUITS.index(state['trump'])
+    lead = -1 if state['lead_suit'] is None else BB_SUITS.index(state['lead_suit'])
+    # Only the dealer saw the discard
+    discarded = -1
+    if me == dealer and state['discarded_card'] is not None:
+        discarded = CARD_INDEX[state['discarded_card']]
+    # Each seat's cards in play order, and the trick in progress by seat
+    # relative to the player
+    played = [[CARD_INDEX[card] for card in cards] for cards in state['played']]
+    center = [((seat - me) % 4, CARD_INDEX[card.get_index()])
+              for card, seat in zip(state['center'], state['order'])]
+
+    best, best_k = None, 0
+    for k, (suits, cards) in enumerate(zip(SUIT_PERMUTATIONS, CARD_PERMUTATIONS)):
+        key = (suits[trump] if trump >= 0 else -1,
+               suits[lead] if lead >= 0 else -1,
+               cards[flipped],
+               permute_mask(hand, k),
+               cards[discarded] if discarded >= 0 else -1,
+               tuple(tuple(cards[card] for card in seat_cards) for seat_cards in played),
+               tuple((seat, cards[card]) for seat, card in center))
+        if best is None or key < best:
+            best, best_k = key, k
+    return (me, dealer, state['calling_actor'], state['turned_down'] is not None) + best, best_k
+
+def to_canonical_action(action, k):
+    ''' Map a real action id to the canonical action id '''
+    return ACTION_PERMUTATIONS[k][action]
+
+def from_canonical_action(action, k):
+    ''' Map a canonical action id back to the real action id '''
+    return ACTION_PERMUTATIONS[INVERSE_PERMUTATIONS[k]][action]
+
+def canonical_legal_actions(legal_actions, k):
+    ''' Canonical ids of the legal actions, in the same order '''
+    actions = ACTION_PERMUTATIONS[k]
+    return [actions[action] for action in legal_actions]
+
+def permute_state(state, k):
+    ''' Relabel the suits of a raw state
+
+    Args:
+        state (dict): A raw Euchre state from the game's get_state
+        k (int): The permutation, use INVERSE_PERMUTATIONS[k] to map back
+
+    Returns:
+        (dict): A new state with every card and suit relabeled
+    '''
+    suits = SUIT_MAPS[k]
+    cards = CARD_PERMUTATIONS[k]
+
+    def card(name):
+        return CARD_LIST[cards[CARD_INDEX[name]]]
+
+    def suit(name):
+        return None if name is None else suits[name]
+
+    new_state = dict(state)
+    new_state['hand'] = [card(c) for c in state['hand']]
+    new_state['flipped'] = card(state['flipped'])
+    new_state['trump'] = suit(state['trump'])
+    new_state['lead_suit'] = suit(state['lead_suit'])
+    new_state['turned_down'] = suit(state['turned_down'])
+    if state['discarded_card'] is not None:
+        new_state['discarded_card'] = card(state['discarded_card'])
+    new_state['center'] = [CARD_OBJECTS[cards[CARD_INDEX[c.get_index()]]] for c in state['center']]
+    new_state['played'] = [[card(c) for c in seat_cards] for seat_cards in state['played']]
+    if 'raw_legal_actions' in state:
+        new_state['raw_legal_actions'] = [_permute_action(action, suits) for action in state['raw_legal_actions']]
+    if 'legal_actions' in state:
+        actions = ACTION_PERMUTATIONS[k]
+        new_state['legal_actions'] = OrderedDict((actions[action], None) for action in state['legal_actions'])
+    if 'legal_mask' in state:
+        new_state['legal_mask'] = np.zeros_like(state['legal_mask'])
+        new_state['legal_mask'][ACTION_PERMUTATIONS[k]] = state['legal_mask']
+    # The observation no longer matches, encode the new state again
+    new_state.pop('obs', None)
+    return new_state
@@ -0,0 +1,61 @@
+''' Pregenerated Euchre deals stored in a memory-mapped file
+
+A deal bank is a .npy file of uint8 rows with 25 bytes each: the 24
+bitboard card indices (see euchre/utils.py) in the order of the
+'custom_deck' config (left of the dealer, across, right, dealer, kitty
+with the flipped card first) followed by the dealer seat. Reading a deal
+is a slice of the memory map, so evaluations can replay the same deals
+across runs without shuffling.
+'''
+import numpy as np
+
+from rlcard.games.euchre.utils import CARD_LIST
+
+DEAL_SIZE = len(CARD_LIST) + 1
+
+def generate_deal_bank(path, num_deals, seed=None, chunk_size=100000):
+    ''' Write num_deals random deals to a deal bank file
+
+    Args:
+        path (str): Output .npy file
+        num_deals (int): Number of deals
+        seed (int): Seed of the deals, the same seed gives the same bank
+        chunk_size (int): Deals generated at a time
+    '''
+    rng = np.random.default_rng(seed)
+    bank = np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=(num_deals, DEAL_SIZE))
+    for start in range(0, num_deals, chunk_size):
+        stop = min(start + chunk_size, num_deals)
+        bank[start:stop, :-1] = rng.random((stop - start, len(CARD_LIST))).argsort(axis=1)
+        bank[start:stop, -1] = rng.integers(0, 4, stop - start)
+    bank.flush()
+    del bank
+
+class DealBank(object):
+    ''' Read-only view of a deal bank file '''
+
+    def __init__(self, path):
+        self.path = path
+        # A plain ndarray view of the map, indexing a memmap is much slower
+        self.deals = np.asarray(np.load(path, mmap_mode='r'))
+        if self.deals.ndim != 2 or self.deals.shape[1] != DEAL_SIZE:
+            raise ValueError('{} is not a deal bank'.format(path))
+
+    def __len__(self):
+        return len(self.deals)
+
+    def get_deal(self, index, rotation=0):
+        ''' Read one deal
+
+        Args:
+            index (int): Index of the deal
+            rotation (int): Seats to move the deal to the left, so with a
+                rotation of 1 every hand goes to the next player as in
+                duplicate play
+
+        Returns:
+            (tuple): The deck as card strings for 'custom_deck' and the
+                dealer seat for 'custom_dealer_id'
+        '''
+        deal = self.deals[index].tolist()
+        return [CARD_LIST[card] for card in deal[:-1]], (deal[-1] + rotation) % 4
@@ -1,34 +1,44 @@
-import random
-
-from rlcard.games.euchre.utils import init_euchre_deck
+from rlcard.games.euchre.utils import init_euchre_deck, EUCHRE_DECK
 
 
 class EuchreDealer(object):
 
-    def __init__(self,custom_deck = None):
+    def __init__(self, np_random, custom_deck = None):
         super().__init__()
         
-        self.deck = init_euchre_deck(custom_deck)
-        if custom_deck is None:
-            self.shuffle()
+        self.np_random = np_random
+        # The deck is allocated once, cards are dealt from position top
+        self.deck = init_euchre_deck()
+        self.top = 0
+        self.reset(custom_deck)
         #self.print_deck()
         self.hand = []
 
+    def reset(self, custom_deck=None):
+        ''' Gather the deck for the next hand, shuffled unless it is custom '''
+        self.top = 0
+        if custom_deck is None:
+            self.shuffle()
+        else:
+            self.deck[:] = init_euchre_deck(custom_deck, self.np_random)
+
     def shuffle(self):
-        random.shuffle(self.deck)
+        # Start from the fixed order, so the deal only depends on the generator
+        self.deck[:] = EUCHRE_DECK
+        self.np_random.shuffle(self.deck)
 
     def deal_cards(self, player, num):
-        for _ in range(num):
-            card = self.deck.pop(0)
-            player.hand.append(card)
+        player.hand.extend(self.deck[self.top:self.top + num])
+        self.top += num
 
     def flip_top_card(self):
-        top_card = self.deck.pop(0)
+        top_card = self.deck[self.top]
+        self.top += 1
         return top_card
 
     def print_deck(self):
         i = 0
-        for card in self.deck:
+        for card in self.deck[self.top:]:
             if(i%5==0):
                 print()
             print(card.get_index(),end=" ")
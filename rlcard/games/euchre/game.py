@@ -1,4 +1,3 @@
-import random
 from copy import copy
 
 from rlcard.games.euchre.utils import cards2list, is_left, is_right, ACTION_SPACE
@@ -6,9 +5,22 @@ from rlcard.games.euchre.utils import cards2list, is_left, is_right, ACTION_SPAC
 from rlcard.games.euchre import Dealer
 from rlcard.games.euchre import Player
 from rlcard.games.euchre import Judger
+from rlcard.games.euchre.state import EuchreState, UNMADE
 
 import numpy as np
 
+class EuchreGameState(EuchreState):
+    ''' State dictionary of EuchreGame, the 'hand' list is made from the
+        player's cards (hand_cards) when it is first read '''
+    __slots__ = ('hand_cards',)
+
+    def __init__(self, items, hand_cards):
+        super().__init__(items)
+        self.hand_cards = hand_cards
+
+    def _make(self, key):
+        return cards2list(self.hand_cards)
+
 class EuchreGame(object):
 
     def __init__(self, allow_step_back=False,config=None):
@@ -18,19 +30,31 @@ class EuchreGame(object):
 
         self.custom_deck = config.get('custom_deck')
         self.custom_dealer = config.get('custom_dealer_id')
+        # Replaced by the env's generator when the env is seeded
+        self.np_random = np.random.RandomState()
+
+        # Reused by every hand, init_game only resets them
+        self.judge = Judger()
+        self.dealer = None
+        self.players = [Player(i) for i in range(self.num_players)]
+        self.history = []
+        self.score = {i:0 for i in range(self.num_players)}
 
     def init_game(self):
         self.payoffs = [0 for _ in range(self.num_players)]
 
-        self.judge = Judger()
-
-        self.dealer = Dealer(custom_deck=self.custom_deck)
+        if self.dealer is None:
+            self.dealer = Dealer(self.np_random, custom_deck=self.custom_deck)
+        else:
+            self.dealer.np_random = self.np_random
+            self.dealer.reset(custom_deck=self.custom_deck)
         if self.custom_dealer is None:
-            self.dealer_player_id = random.randrange(0, self.num_players)
+            self.dealer_player_id = self.np_random.randint(0, self.num_players)
         else:
             self.dealer_player_id = self.custom_dealer
         #print('player',self.dealer_player_id,'is dealer')
-        self.players = [Player(i) for i in range(self.num_players)]
+        for player in self.players:
+            player.hand.clear()
 
         # Deal in order of left, across, right, dealer
         for i in range(self.num_players):
@@ -40,11 +64,13 @@ class EuchreGame(object):
         self.flipped_card = self.dealer.flip_top_card()
         self.calling_player = -1
         # Options: {Avaliable=0,TurnedDown=1,PickedUp=2}
+        # New per hand, states of earlier hands keep referencing their own
         self.flipped_choice = np.zeros(2)
-        self.history = [] # populate with game states
+        self.history.clear() # populate with game states
         self.center = [] 
         self.order = []
-        self.score = {i:0 for i in range(self.num_players)}
+        for i in self.score:
+            self.score[i] = 0
         self.game_over = False
         
         self.trump = None
@@ -58,31 +84,35 @@ class EuchreGame(object):
         state = self.get_state(self.current_player)
         return state, self.current_player
 
-    def get_state(self, player_id):
-        state = {}
-        player = self.players[player_id]
-        state['hand'] = cards2list(player.hand)
-        state['trump_called'] = self.trump is not None
-        # Important to remember at each state who called trump
-        state['calling_actor'] = self.calling_player
-        state['dealer_actor'] = self.dealer_player_id
-        state['trump'] = self.trump
-        state['turned_down'] = self.turned_down
-        state['lead_suit'] = self.lead_suit
-        
-        state['flipped'] = self.flipped_card.get_index()
-        state['flipped_choice'] = self.flipped_choice
-        state['discarded_card'] = self.discarded_card
+    def get_deal(self):
+        ''' The deck and dealer of the current hand, in the format of the
+            'custom_deck' and 'custom_dealer_id' configs, to replay it '''
+        return [card.get_index() for card in self.dealer.deck], self.dealer_player_id
 
-        state['center'] = self.center
-        state['order'] = self.order
-        state['played'] = self.played
-        state['current_actor'] = self.current_player
-        return state
+    def get_state(self, player_id):
+        items = {
+            'hand': UNMADE,
+            'trump_called': self.trump is not None,
+            # Important to remember at each state who called trump
+            'calling_actor': self.calling_player,
+            'dealer_actor': self.dealer_player_id,
+            'trump': self.trump,
+            'turned_down': self.turned_down,
+            'lead_suit': self.lead_suit,
+            'flipped': self.flipped_card.get_index(),
+            'flipped_choice': self.flipped_choice,
+            'discarded_card': self.discarded_card,
+            'center': self.center,
+            'order': self.order,
+            'played': self.played,
+            'current_actor': self.current_player,
+            'player_id': player_id,
+        }
+        return EuchreGameState(items, tuple(self.players[player_id].hand))
 
     def step(self, action):
         if self.allow_step_back:
-            self._add_to_history()
+            self._add_to_history(action)
 
         if action == 'pick':
             self._perform_pick_action()
@@ -212,21 +242,50 @@ class EuchreGame(object):
     def get_player_id(self):
         return self.current_player
 
-    def _add_to_history(self):
+    def _add_to_history(self, action):
+        ''' Push an undo record for action, which is about to be applied.
+
+        The record holds the card that moves (and where it sat in the hand)
+        plus the scalars the action may change. The center and order lists
+        are kept by reference: a trick end replaces them instead of clearing
+        them, so the old lists still hold the finished trick.
         '''
-        - All Players Hands
-        - What card was in the center
-        - The avaliability of the center card
-        - What is trump
-        - Who is the dealer
-        - Who is the current player
-        - What cards are in the center
-        - What card was lead
-        - What team has won the last tricks
-        - Is the game over
+        card = hand_index = None
+        if action.startswith('discard') or action[0] in 'HDSC':
+            hand = self.players[self.current_player].hand
+            name = action.split('-')[-1]
+            hand_index = next(i for i, hand_card in enumerate(hand) if hand_card.get_index() == name)
+            card = hand[hand_index]
+        self.history.append((action, card, hand_index, self.current_player, self.trump, self.lead_suit,
+                             self.turned_down, self.calling_player, self.discarded_card,
+                             tuple(self.flipped_choice), self.center, self.order))
+
+    def step_back(self):
+        ''' Undo the last action
+
+        Returns:
+            (bool): True if the game steps back successfully
         '''
+        if not self.history:
+            return False
+        action, card, hand_index, current_player, self.trump, self.lead_suit, self.turned_down, \
+            self.calling_player, self.discarded_card, flipped_choice, self.center, self.order = self.history.pop()
+        self.flipped_choice[:] = flipped_choice
+        self.game_over = False
 
-        return NotImplementedError
+        if action == 'pick':
+            self.players[self.dealer_player_id].hand.pop()
+        elif card is not None:
+            self.players[current_player].hand.insert(hand_index, card)
+            if not action.startswith('discard'):
+                if len(self.center) == 4:
+                    # The play ended the trick, and the trick winner leads next
+                    self.score[self.current_player] -= 1
+                self.center.pop()
+                self.order.pop()
+                self.played[current_player].pop()
+        self.current_player = current_player
+        return True
 
     @staticmethod
     def get_num_actions():
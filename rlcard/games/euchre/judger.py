@@ -1,4 +1,26 @@
-from rlcard.games.euchre.utils import is_left, is_right, NON_TRUMP
+import numpy as np
+
+from rlcard.games.euchre.utils import LEFT, NON_TRUMP, BB_SUITS, CARD_LIST, CARD_INDEX
+
+def _card_strength(card, trump, lead):
+    ''' Strength of a card in a trick, 0 when it can not win the trick '''
+    if card == trump + 'J':
+        return 13
+    if card == LEFT[trump]:
+        return 12
+    if card[0] == trump:
+        # the jack of trump is the right bower, so 7 to 11 skips it
+        return 7 + [r for r in NON_TRUMP if r != 'J'].index(card[1])
+    if card[0] == lead:
+        return 1 + NON_TRUMP.index(card[1])
+    return 0
+
+# TRICK_STRENGTH[t, l, c] is the strength of card c (bitboard index) when
+# suit BB_SUITS[t] is trump and the (effective) suit BB_SUITS[l] was led
+TRICK_STRENGTH = np.array([[[_card_strength(card, trump, lead) for card in CARD_LIST]
+                            for lead in BB_SUITS] for trump in BB_SUITS], dtype=np.int8)
+_STRENGTH = {(trump, lead): TRICK_STRENGTH[t, l].tolist()
+             for t, trump in enumerate(BB_SUITS) for l, lead in enumerate(BB_SUITS)}
 
 class EuchreJudger(object):
 
@@ -6,49 +28,25 @@ class EuchreJudger(object):
         pass
 
     def judge_trick(self, game):
-        center_cards = game.center
-        trump = game.trump
-        leader = game.current_player
-        player_order = self._get_player_order(leader)
-        center_cards = {}
-        for i,p in enumerate(player_order):
-            center_cards[p] = game.center[i]
-
-        lead_suit = center_cards[leader].suit
-        winning_card = center_cards[leader]
-        
-        if is_right(winning_card, trump):
-            return [k for k, v in center_cards.items() if winning_card == v][0]
-
-        for player in player_order[1:]:
-            candidate_card = center_cards[player]
-            
-            if is_right(candidate_card, trump):
-                winning_card = candidate_card
-                break
-
-            if is_left(winning_card, trump):
-                continue
-
-            if is_left(candidate_card, trump):
-                winning_card = candidate_card
-                continue
-
-            if (candidate_card.suit != trump):
-                if candidate_card.suit == lead_suit:
-                    if NON_TRUMP.index(candidate_card.rank) > NON_TRUMP.index(winning_card.rank):
-                        winning_card = candidate_card
-                        continue
-            
-            if (candidate_card.suit == trump):
-                if candidate_card.suit != winning_card.suit:
-                    winning_card = candidate_card
-                    continue
-                if NON_TRUMP.index(candidate_card.rank) > NON_TRUMP.index(winning_card.rank):
-                    winning_card = candidate_card
-                    continue
-        
-        return [k for k, v in center_cards.items() if winning_card == v][0]
+        strength = _STRENGTH[(game.trump, game.lead_suit)]
+        values = [strength[CARD_INDEX[card.get_index()]] for card in game.center]
+        return game.order[values.index(max(values))]
+
+    @staticmethod
+    def judge_tricks(trumps, leads, cards):
+        ''' Judge a batch of tricks
+
+        Args:
+            trumps (numpy.array): (batch,) trump suit indices into BB_SUITS
+            leads (numpy.array): (batch,) lead suit indices into BB_SUITS
+            cards (numpy.array): (batch, 4) bitboard card indices in play order
+
+        Returns:
+            (numpy.array): (batch,) position of the winning card in each trick
+        '''
+        trumps = np.asarray(trumps)[:, np.newaxis]
+        leads = np.asarray(leads)[:, np.newaxis]
+        return TRICK_STRENGTH[trumps, leads, cards].argmax(axis=1)
 
     def judge_hand(self, game):
         team_1_score = game.score[0] + game.score[2]
@@ -60,6 +58,3 @@ class EuchreJudger(object):
             return [1,3], 2
         else:
             return [1,3], 1
-
-    def _get_player_order(self, leader):
-        return [(i+leader)%4 for i in range(4)]
\ No newline at end of file
@@ -0,0 +1,113 @@
+from rlcard.games.euchre import Game
+
+class EuchreMatch(object):
+    ''' Chains Euchre hands into a match played to 'match_points' points.
+
+    The dealer rotates to the left after every hand and the points of each
+    hand, from the judger, are added to the team scores. One game object
+    plays every hand, it is reset instead of rebuilt between hands. Stepping
+    back only works within the current hand.
+    '''
+
+    def __init__(self, allow_step_back=False, config=None, game=None):
+        ''' Initialize the match
+
+        Args:
+            allow_step_back (bool): Allow stepping back within a hand
+            config (dict): Game config, 'match_points' (int) is the score
+                that wins the match, 10 by default
+            game (object): The hand engine, a new EuchreGame if None
+        '''
+        self.game = game if game is not None else Game(allow_step_back=allow_step_back, config=config)
+        self.game.allow_step_back = allow_step_back
+        self.num_players = self.game.get_num_players()
+        self.match_points = config.get('match_points', 10)
+        self.first_dealer = config.get('custom_dealer_id')
+        self.np_random = self.game.np_random
+
+    @property
+    def allow_step_back(self):
+        return self.game.allow_step_back
+
+    @allow_step_back.setter
+    def allow_step_back(self, allow_step_back):
+        self.game.allow_step_back = allow_step_back
+
+    @property
+    def np_random(self):
+        return self._np_random
+
+    @np_random.setter
+    def np_random(self, np_random):
+        # The hands share the random state of the match
+        self._np_random = np_random
+        self.game.np_random = np_random
+
+    def init_game(self):
+        self.match_score = [0, 0]
+        self.hand_number = 0
+        self.match_over = False
+        self.winner = None
+        if self.first_dealer is None:
+            self.dealer_player_id = self.np_random.randint(0, self.num_players)
+        else:
+            self.dealer_player_id = self.first_dealer
+        return self._init_hand()
+
+    def _init_hand(self):
+        self.game.custom_dealer = self.dealer_player_id
+        _, player_id = self.game.init_game()
+        return self.get_state(player_id), player_id
+
+    def step(self, action):
+        _, player_id = self.game.step(action)
+        if not self.game.is_over():
+            return self.get_state(player_id), player_id
+
+        winner, points = self.game.winner, self.game.points
+        team = 0 if 0 in winner else 1
+        self.match_score[team] += points
+        if self.match_score[team] >= self.match_points:
+            self.match_over = True
+            self.winner = winner
+            return self.get_state(player_id), player_id
+
+        self.hand_number += 1
+        self.dealer_player_id = (self.dealer_player_id + 1) % self.num_players
+        return self._init_hand()
+
+    def step_back(self):
+        ''' Undo the last action of the current hand
+
+        Returns:
+            (bool): True if the game steps back successfully
+        '''
+        if self.match_over:
+            return False
+        return self.game.step_back()
+
+    def get_state(self, player_id):
+        state = self.game.get_state(player_id)
+        # Team scores, team 0 is players 0 and 2
+        state['match_score'] = list(self.match_score)
+        state['hand_number'] = self.hand_number
+        return state
+
+    def get_legal_actions(self):
+        return self.game.get_legal_actions()
+
+    def get_num_players(self):
+        return self.num_players
+
+    def get_num_actions(self):
+        return self.game.get_num_actions()
+
+    def get_payoffs(self):
+        ''' 1 for the players of the team that won the match, -1 otherwise '''
+        return {i: 1 if i in self.winner else -1 for i in range(self.num_players)}
+
+    def is_over(self):
+        return self.match_over
+
+    def get_player_id(self):
+        return self.game.get_player_id()
@@ -0,0 +1,41 @@
+''' Lazy state dictionaries of the Euchre engines '''
+from collections.abc import MutableMapping
+
+# Placeholder of the state values that are made when first read
+UNMADE = object()
+
+class EuchreState(MutableMapping):
+    ''' State dictionary whose expensive values are made on first read
+
+    The engines put UNMADE in place of the card lists and keep what is
+    needed to make them on the state, subclasses make them in _make. Keys
+    can be set and deleted as in a dict.
+    '''
+    __slots__ = ('_items',)
+
+    def __init__(self, items):
+        self._items = items
+
+    def _make(self, key):
+        raise NotImplementedError
+
+    def __getitem__(self, key):
+        value = self._items[key]
+        if value is UNMADE:
+            value = self._items[key] = self._make(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._items[key] = value
+
+    def __delitem__(self, key):
+        del self._items[key]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, dict(self))
@@ -65,35 +65,98 @@ ACTION_LIST = list(ACTION_SPACE.keys())
 NON_TRUMP = ['9', 'T', 'J', 'Q', 'K', 'A']  # this order matters
 SUIT_LIST = ['S', 'H', 'D', 'C']
 
-def init_euchre_deck(customDeck=None):
+# Bitboard layout: card i is bit i, in the same order as the card actions of
+# ACTION_SPACE (suits H, D, S, C; ranks A down to 9), so the play action of
+# card i is 6 + i and its discard action is 30 + i.
+CARD_LIST = ACTION_LIST[6:30]
+CARD_INDEX = {card: i for i, card in enumerate(CARD_LIST)}
+BB_SUITS = ['H', 'D', 'S', 'C']
+SUIT_MASK = {suit: 0b111111 << (6 * i) for i, suit in enumerate(BB_SUITS)}
+CARD_SUIT = [card[0] for card in CARD_LIST]
+RIGHT_BIT = {suit: 1 << CARD_INDEX[suit + 'J'] for suit in BB_SUITS}
+LEFT_BIT = {suit: 1 << CARD_INDEX[LEFT[suit]] for suit in BB_SUITS}
+TRUMP_MASK = {suit: SUIT_MASK[suit] | LEFT_BIT[suit] for suit in BB_SUITS}
+# Cards that follow `lead` when `trump` is trump, keyed by (trump, lead)
+FOLLOW_MASK = {(trump, lead): TRUMP_MASK[trump] if lead == trump else SUIT_MASK[lead] & ~LEFT_BIT[trump]
+               for trump in BB_SUITS for lead in BB_SUITS}
+# Card strings and indices of every 12-bit half of a mask, so masks decode
+# with 2 lookups
+_HALF_CARDS = [[[CARD_LIST[12 * h + i] for i in range(12) if half >> i & 1] for half in range(4096)]
+               for h in range(2)]
+_HALF_INDICES = [[[12 * h + i for i in range(12) if half >> i & 1] for half in range(4096)]
+                 for h in range(2)]
+# One shared Card per bitboard index for engines that expose Card objects
+CARD_OBJECTS = [Card(card[0], card[1]) for card in CARD_LIST]
+# The unshuffled deck of init_euchre_deck and EuchreDealer, made of the shared cards
+EUCHRE_DECK = tuple(CARD_OBJECTS[CARD_INDEX[suit + rank]] for suit in SUIT_LIST for rank in NON_TRUMP)
+
+# Observation layout. Seats are relative to the observing player
+# (0 = self, 1 = left opponent, 2 = partner, 3 = right opponent).
+OBS_HAND = 0            # 24, cards in hand
+OBS_FLIPPED = 24        # 24, the flipped card
+OBS_TURNED_DOWN = 48    # 1, the flipped card was turned down
+OBS_TRUMP = 49          # 4, trump suit in BB_SUITS order
+OBS_DEALER = 53         # 4, dealer seat
+OBS_CALLER = 57         # 4, seat that called trump
+OBS_CENTER = 61         # 4 x 24, card in the center for each seat
+OBS_PLAYED = 157        # 4 x 24, cards played by each seat
+OBS_DISCARD = 253       # 24, card discarded by the dealer (dealer only)
+OBS_SIZE = 277
+
+def init_euchre_deck(customDeck=None, np_random=None):
     ''' Initialize a standard deck of 52 cards
     Parameters:
         customDeck: List of 24 valid euchre cards to be dealt in this order:
                                 Across Dealer (5-9)
         Left of Dealer (0-4)                            Right of Dealer(10-14)
                                 Dealer (15-19)  Kitty (20-23)
+        np_random: RandomState that fills 'XX' entries of customDeck, the
+                   global random module if None
     Returns:
         (list): A list of Card object
     '''
     
-    res = [Card(suit, rank) for suit in SUIT_LIST for rank in NON_TRUMP]
+    res = list(EUCHRE_DECK)
+    if customDeck is not None and 'XX' not in customDeck:
+        # Fully specified decks, e.g. from a deal bank, skip the removals
+        cards = set(customDeck)
+        if not cards <= CARD_INDEX.keys():
+            for card in customDeck:
+                is_valid_card(card)
+        if len(cards) != len(customDeck):
+            raise ValueError('Duplicate cards in custom deck')
+        return [CARD_OBJECTS[CARD_INDEX[card]] for card in customDeck]
     if customDeck is not None:
         result = []
         for card in customDeck:
             if card == 'XX':
-                random_card_ind = random.randrange(0,len(res))
+                if np_random is None:
+                    random_card_ind = random.randrange(0,len(res))
+                else:
+                    random_card_ind = np_random.randint(0,len(res))
                 result.append(res[random_card_ind])
                 res.pop(random_card_ind)
             else:
                 is_valid_card(card)
-                result.append(Card(card[0],card[1]))
-                res.remove(Card(card[0],card[1]))
+                result.append(CARD_OBJECTS[CARD_INDEX[card]])
+                res.remove(CARD_OBJECTS[CARD_INDEX[card]])
         res = result
     return res
 
 def cards2list(cards):
     return [card.get_index() for card in cards]
 
+def mask2list(mask):
+    return _HALF_CARDS[0][mask & 4095] + _HALF_CARDS[1][mask >> 12]
+
+def mask2indices(mask):
+    ''' Indices of the cards of a mask, in bitboard order '''
+    return _HALF_INDICES[0][mask & 4095] + _HALF_INDICES[1][mask >> 12]
+
+def lowest_card(mask):
+    ''' Index of the lowest set bit, i.e. the highest ranked card of a suit '''
+    return (mask & -mask).bit_length() - 1
+
 def is_left(card, trump):
     return card.get_index() == LEFT[trump]
 
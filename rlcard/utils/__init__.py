@@ -2,3 +2,5 @@ from rlcard.utils.logger import Logger
 from rlcard.utils import seeding
 from rlcard.utils.utils import *
 from rlcard.utils.pettingzoo_utils import *
+from rlcard.utils.trajectory_buffer import TrajectoryBuffer
+from rlcard.utils.lazy_state import LazyState
@@ -0,0 +1,131 @@
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+from rlcard.utils.utils import legal_mask
+
+class LazyState(MutableMapping):
+    ''' Dictionary-like state returned by env._extract_state
+
+    Only the observation and the legal action ids are stored when the state
+    is built. The legal_actions OrderedDict, the 'legal_mask' boolean array
+    and the raw legal actions are created on first access, so training loops
+    only pay for what they read. It behaves like the state dict it replaces: items can be
+    read, set and iterated with the same keys.
+
+    With flat=True the keys of the raw game state are keys of the state
+    itself (as in EuchreEnv), otherwise the raw state is under 'raw_obs'
+    (as in LeducholdemEnv).
+    '''
+    __slots__ = ('obs', 'legal_ids', 'raw_obs', 'action_record', '_flat', '_action_names',
+                 '_num_actions', '_legal_actions', '_legal_mask', '_raw_legal_actions', '_extra')
+
+    def __init__(self, obs, legal_ids, raw_obs=None, action_names=None, raw_legal_actions=None,
+                 action_record=None, flat=False, num_actions=None):
+        ''' Initialize the state
+
+        Args:
+            obs (numpy.array): The observation
+            legal_ids (list): The legal action ids
+            raw_obs (dict): The raw game state
+            action_names (list): The raw action of every action id, used to
+                make the raw legal actions on first access
+            raw_legal_actions (list): The raw legal actions, if they are
+                already known
+            action_record (list): The actions taken so far
+            flat (bool): Expose the keys of raw_obs as keys of the state
+            num_actions (int): The size of the action space, defaults to
+                the number of action names
+        '''
+        self.obs = obs
+        self.legal_ids = legal_ids
+        self.raw_obs = raw_obs
+        self.action_record = action_record
+        self._flat = flat
+        self._action_names = action_names
+        self._num_actions = num_actions if num_actions is not None else len(action_names)
+        self._legal_actions = None
+        self._legal_mask = None
+        self._raw_legal_actions = raw_legal_actions
+        self._extra = None
+
+    @property
+    def legal_actions(self):
+        if self._legal_actions is None:
+            self._legal_actions = OrderedDict.fromkeys(self.legal_ids)
+        return self._legal_actions
+
+    @property
+    def legal_mask(self):
+        if self._legal_mask is None:
+            self._legal_mask = legal_mask(self.legal_ids, self._num_actions)
+        return self._legal_mask
+
+    @property
+    def raw_legal_actions(self):
+        if self._raw_legal_actions is None:
+            self._raw_legal_actions = [self._action_names[i] for i in self.legal_ids]
+        return self._raw_legal_actions
+
+    def __getitem__(self, key):
+        if key == 'obs':
+            return self.obs
+        if key == 'legal_actions':
+            return self.legal_actions
+        if key == 'legal_mask':
+            return self.legal_mask
+        if key == 'raw_legal_actions':
+            return self.raw_legal_actions
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        if self._flat:
+            return self.raw_obs[key]
+        if key == 'raw_obs' and self.raw_obs is not None:
+            return self.raw_obs
+        if key == 'action_record' and self.action_record is not None:
+            return self.action_record
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == 'obs':
+            self.obs = value
+        elif key == 'legal_actions':
+            self._legal_actions = value
+            self.legal_ids = list(value)
+            self._legal_mask = None
+        elif key == 'legal_mask':
+            self._legal_mask = value
+        elif key == 'raw_legal_actions':
+            self._raw_legal_actions = value
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __iter__(self):
+        yield 'obs'
+        yield 'legal_actions'
+        yield 'legal_mask'
+        yield 'raw_legal_actions'
+        extra = self._extra if self._extra is not None else {}
+        if self._flat:
+            for key in self.raw_obs:
+                if key not in extra:
+                    yield key
+        else:
+            if self.raw_obs is not None and 'raw_obs' not in extra:
+                yield 'raw_obs'
+            if self.action_record is not None and 'action_record' not in extra:
+                yield 'action_record'
+        for key in extra:
+            yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return 'LazyState({})'.format(dict(self))
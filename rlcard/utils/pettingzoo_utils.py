@@ -12,6 +12,7 @@ def wrap_state(state):
     legal_actions = np.flatnonzero(state["action_mask"])
     # the values of legal_actions isn't available so setting them to None
     wrapped_state["legal_actions"] = {l: None for l in legal_actions}
+    wrapped_state["legal_mask"] = np.asarray(state["action_mask"], dtype=np.bool_)
     # raw_legal_actions isn't available so setting it to legal actions
     wrapped_state["raw_legal_actions"] = list(wrapped_state["legal_actions"].keys())
     return wrapped_state
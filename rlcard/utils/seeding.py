@@ -31,6 +31,10 @@ def error(msg, *args):
     print(colorize('%s: %s'%('ERROR', msg % args), 'red'))
 
 def np_random(seed=None):
+    # A SeedSequence, e.g. from spawn_seeds, drives the generator directly
+    if isinstance(seed, np.random.SeedSequence):
+        return np.random.RandomState(np.random.MT19937(seed)), seed
+
     if seed is not None and not (isinstance(seed, int) and 0 <= seed):
         raise error.Error('Seed must be a non-negative integer or omitted, not {}'.format(seed))
 
@@ -40,6 +44,21 @@ def np_random(seed=None):
     rng.seed(_int_list_from_bigint(hash_seed(seed)))
     return rng, seed
 
+def spawn_seeds(seed=None, n=1):
+    """Spawn n independent seed streams, one per environment or actor.
+
+    Every stream is a numpy SeedSequence child of seed, so the streams do
+    not overlap and the same seed always gives the same streams. Pass them
+    to Env.seed or as the 'seed' config of rlcard.make.
+
+    Args:
+        seed (Optional[int, SeedSequence]): Root seed, None draws entropy from the OS.
+        n (int): Number of streams.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(n)
+
 def hash_seed(seed=None, max_bytes=8):
     """Any given evaluation is likely to have many PRNG's active at
     once. (Most commonly, because the environment is running in
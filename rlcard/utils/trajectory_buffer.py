@@ -0,0 +1,108 @@
+import numpy as np
+
+class TrajectoryBuffer(object):
+    ''' Preallocated per-player arrays that Env.run_arrays writes an episode into.
+
+    Row t of a player holds the observation the player acted on at its t-th
+    decision, the action id, the legal-action mask of that observation, the
+    reward and the done flag. One extra observation row holds the final
+    state, so the next observations are a view of the same array shifted by
+    one row. The arrays grow when an episode is longer than the capacity and
+    are reused by the next episode, so views returned by get_transitions are
+    only valid until the buffer is cleared.
+    '''
+
+    def __init__(self, num_players, num_actions, capacity=64):
+        ''' Initialize the buffer
+
+        Args:
+            num_players (int): The number of players
+            num_actions (int): The size of the action space
+            capacity (int): Decisions per player to allocate for
+        '''
+        self.num_players = num_players
+        self.num_actions = num_actions
+        self.capacity = capacity
+        self.obs = [None for _ in range(num_players)]
+        self.actions = [np.zeros(capacity, dtype=np.int64) for _ in range(num_players)]
+        self.legal_masks = [np.zeros((capacity + 1, num_actions), dtype=bool) for _ in range(num_players)]
+        self.rewards = [np.zeros(capacity, dtype=np.float32) for _ in range(num_players)]
+        self.dones = [np.zeros(capacity, dtype=bool) for _ in range(num_players)]
+        self.sizes = [0 for _ in range(num_players)]
+
+    def clear(self):
+        ''' Start a new episode, keeping the arrays '''
+        for player_id in range(self.num_players):
+            self.sizes[player_id] = 0
+
+    def add(self, player_id, state, action):
+        ''' Record a decision of a player
+
+        Args:
+            player_id (int): The acting player
+            state (dict): The state the player acted on
+            action (int): The action id
+        '''
+        t = self.sizes[player_id]
+        if t == len(self.actions[player_id]):
+            self._grow(player_id)
+        self._write_state(player_id, t, state)
+        self.actions[player_id][t] = action
+        self.rewards[player_id][t] = 0
+        self.dones[player_id][t] = False
+        self.sizes[player_id] = t + 1
+
+    def finish(self, player_id, state, payoff):
+        ''' Record the final state and payoff of a player
+
+        Args:
+            player_id (int): The player
+            state (dict): The final state of the player
+            payoff (float): The payoff of the player
+        '''
+        t = self.sizes[player_id]
+        self._write_state(player_id, t, state)
+        if t > 0:
+            self.rewards[player_id][t - 1] = payoff
+            self.dones[player_id][t - 1] = True
+
+    def get_transitions(self, player_id):
+        ''' Views of the transitions of a player
+
+        Returns:
+            (dict): Arrays with one row per decision: 'obs', 'actions',
+                'rewards', 'next_obs', 'legal_masks' (of obs),
+                'next_legal_masks' (of next_obs) and 'dones'
+        '''
+        t = self.sizes[player_id]
+        if self.obs[player_id] is None:
+            return None
+        obs = self.obs[player_id]
+        masks = self.legal_masks[player_id]
+        return {
+            'obs': obs[:t],
+            'actions': self.actions[player_id][:t],
+            'rewards': self.rewards[player_id][:t],
+            'next_obs': obs[1:t + 1],
+            'legal_masks': masks[:t],
+            'next_legal_masks': masks[1:t + 1],
+            'dones': self.dones[player_id][:t],
+        }
+
+    def _write_state(self, player_id, t, state):
+        obs = np.asarray(state['obs'])
+        if self.obs[player_id] is None:
+            self.obs[player_id] = np.zeros((len(self.actions[player_id]) + 1,) + obs.shape, dtype=obs.dtype)
+        self.obs[player_id][t] = obs
+        self.legal_masks[player_id][t] = state['legal_mask']
+
+    def _grow(self, player_id):
+        ''' Double the capacity of a player '''
+        size = 2 * len(self.actions[player_id])
+        for arrays in (self.actions, self.rewards, self.dones):
+            arrays[player_id] = np.resize(arrays[player_id], size)
+        for arrays in (self.obs, self.legal_masks):
+            if arrays[player_id] is not None:
+                old = arrays[player_id]
+                arrays[player_id] = np.zeros((size + 1,) + old.shape[1:], dtype=old.dtype)
+                arrays[player_id][:len(old)] = old
@@ -4,12 +4,9 @@ from rlcard.games.base import Card
 
 def set_seed(seed):
     if seed is not None:
-        import subprocess
-        import sys
+        import importlib.util
 
-        reqs = subprocess.check_output([sys.executable, '-m', 'pip', 'freeze'])
-        installed_packages = [r.decode().split('==')[0] for r in reqs.split()]
-        if 'torch' in installed_packages:
+        if importlib.util.find_spec('torch') is not None:
             import torch
             torch.backends.cudnn.deterministic = True
             torch.manual_seed(seed)
@@ -181,7 +178,8 @@ def remove_illegal(action_probs, legal_actions):
 
     Args:
         action_probs (numpy.array): A 1 dimention numpy array.
-        legal_actions (list): A list of indices of legal actions.
+        legal_actions (list): A list of indices of legal actions,
+            or the boolean legal-action mask.
 
     Returns:
         probd (numpy.array): A normalized vector without legal actions.
@@ -189,11 +187,40 @@ def remove_illegal(action_probs, legal_actions):
     probs = np.zeros(action_probs.shape[0])
     probs[legal_actions] = action_probs[legal_actions]
     if np.sum(probs) == 0:
-        probs[legal_actions] = 1 / len(legal_actions)
+        if isinstance(legal_actions, np.ndarray) and legal_actions.dtype == np.bool_:
+            probs[legal_actions] = 1 / np.count_nonzero(legal_actions)
+        else:
+            probs[legal_actions] = 1 / len(legal_actions)
     else:
         probs /= sum(probs)
     return probs
 
+def legal_mask(legal_actions, num_actions):
+    ''' Boolean mask of the legal actions
+
+    Args:
+        legal_actions (list): A list of indices of legal actions.
+        num_actions (int): The size of the action space.
+
+    Returns:
+        mask (numpy.array): A boolean vector, True for the legal actions.
+    '''
+    mask = np.zeros(num_actions, dtype=np.bool_)
+    mask[list(legal_actions)] = True
+    return mask
+
+def random_legal_actions(legal_masks):
+    ''' Draw a uniformly random legal action for every row of a batch
+
+    Args:
+        legal_masks (numpy.array): (batch, num_actions) legal-action masks.
+
+    Returns:
+        actions (numpy.array): (batch,) action ids, 0 for rows without
+            legal actions.
+    '''
+    return np.argmax(np.random.random_sample(np.shape(legal_masks)) * legal_masks, axis=1)
+
 def tournament(env, num):
     ''' Evaluate he performance of the agents in the environment
 
@@ -204,6 +231,13 @@ def tournament(env, num):
     Returns:
         A list of avrage payoffs for each player
     '''
+    payoffs, counter = _sum_payoffs(env, num)
+    for i, _ in enumerate(payoffs):
+        payoffs[i] /= counter
+    return payoffs
+
+def _sum_payoffs(env, num):
+    ''' Play at least num games and return the payoff sums and the game count '''
     payoffs = [0 for _ in range(env.num_players)]
     counter = 0
     while counter < num:
@@ -217,10 +251,185 @@ def tournament(env, num):
             for i, _ in enumerate(payoffs):
                 payoffs[i] += _payoffs[i]
             counter += 1
+    return payoffs, counter
+
+def _load_agent(agent):
+    ''' Agents are objects or paths of agents saved with torch.save '''
+    if isinstance(agent, str):
+        import torch
+        return torch.load(agent, map_location='cpu', weights_only=False)
+    return agent
+
+def _tournament_shard(env_id, config, agents, num, seed):
+    ''' Play one shard of parallel_tournament in a worker process '''
+    import random
+    import rlcard
+    from rlcard.utils import seeding
+
+    # The env and the global generators that agents use get their own streams
+    env_seed, agent_seed = seeding.spawn_seeds(seed, 2)
+    agent_seed = int(agent_seed.generate_state(1)[0])
+    np.random.seed(agent_seed)
+    random.seed(agent_seed)
+    config = dict(config, seed=env_seed)
+    env = rlcard.make(env_id, config=config)
+    env.set_agents([_load_agent(agent) for agent in agents])
+    return _sum_payoffs(env, num)
+
+def parallel_tournament(env_id, agents, num, config=None, num_workers=None, num_shards=None, seed=None):
+    ''' Evaluate agents on a process pool
+
+    The games are split into shards. Every shard builds its own environment
+    with rlcard.make and its own copy of the agents, and is seeded from a
+    distinct stream spawned from seed, so results depend on seed and
+    num_shards but not on the number of workers.
+
+    Args:
+        env_id (str): The environment id for rlcard.make.
+        agents (list): One agent per player, either an agent object, which
+            is pickled to the workers, or the path of an agent saved with
+            torch.save, which each worker loads.
+        num (int): The number of games to play.
+        config (dict): The environment config, its 'seed' is replaced.
+        num_workers (int): Size of the pool, the number of CPUs if None.
+        num_shards (int): The number of shards, 4 per worker if None.
+        seed (int): The root seed.
+
+    Returns:
+        A list of avrage payoffs for each player
+    '''
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+    from rlcard.utils import seeding
+
+    if num_workers is None:
+        num_workers = os.cpu_count()
+    if num_shards is None:
+        num_shards = 4 * num_workers
+    num_shards = max(1, min(num_shards, num))
+    config = {} if config is None else config
+    seeds = seeding.spawn_seeds(seed, num_shards)
+    sizes = [num // num_shards + (1 if i < num % num_shards else 0) for i in range(num_shards)]
+
+    payoffs, counter = None, 0
+    with ProcessPoolExecutor(max_workers=num_workers) as pool:
+        futures = [pool.submit(_tournament_shard, env_id, config, agents, size, shard_seed)
+                   for size, shard_seed in zip(sizes, seeds)]
+        for future in futures:
+            _payoffs, _counter = future.result()
+            if payoffs is None:
+                payoffs = _payoffs
+            else:
+                for i, _ in enumerate(payoffs):
+                    payoffs[i] += _payoffs[i]
+            counter += _counter
     for i, _ in enumerate(payoffs):
         payoffs[i] /= counter
     return payoffs
 
+def duplicate_tournament_iter(env, num, rotations=2, confidence=0.95):
+    ''' Play duplicate boards and yield the running results after each one
+
+    A board is one deal played `rotations` times. Every replay moves each
+    agent one seat to the left, so with rotations=2 the two teams of a
+    four player game swap cards, and with rotations=4 every agent also
+    sits at every distance from the dealer, so the agents see the same
+    cards from the other seats. Comparing agents on the same deals removes
+    most of the luck of the deal from the payoff difference.
+
+    The deal is replayed with env.set_deal for envs that play a deal bank,
+    and through the game's custom_deck and custom_dealer for games with
+    get_deal (Euchre). Both check that every replay deals the same cards.
+    Other games are replayed by restoring env.game.np_random, which only
+    works for games that draw the whole deal from it at each reset.
+
+    Args:
+        env (Env class): The environment, with agents set.
+        num (int): The number of boards to play.
+        rotations (int): Replays of each deal, between 1 and env.num_players.
+        confidence (float): Confidence level of the reported interval.
+
+    Yields:
+        (dict): Results so far, with keys
+            'boards': the number of boards played,
+            'payoffs': the average payoff of the agent of each seat of
+                env.agents, over all replays,
+            'diff': the average paired difference between the payoffs of
+                the agents of seats 0 and 1 per board,
+            'ci': the half width of the confidence interval of 'diff'.
+    '''
+    if not 1 <= rotations <= env.num_players:
+        raise ValueError('rotations must be between 1 and {}'.format(env.num_players))
+    from statistics import NormalDist
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    agents = list(env.agents)
+    num_players = env.num_players
+    game = env.game
+    bank = getattr(env, 'deal_bank', None) is not None
+    replay = bank or hasattr(game, 'get_deal')
+    if replay and not bank:
+        custom = game.custom_deck, game.custom_dealer
+    totals = [0.0 for _ in range(num_players)]
+    mean, m2 = 0.0, 0.0
+    try:
+        for board in range(1, num + 1):
+            if bank:
+                index = env.deal_index
+            elif not replay:
+                rng_state = game.np_random.get_state()
+            deal = None
+            board_payoffs = [0.0 for _ in range(num_players)]
+            for r in range(rotations):
+                if bank:
+                    env.set_deal(index)
+                elif not replay:
+                    game.np_random.set_state(rng_state)
+                elif deal is not None:
+                    game.custom_deck, game.custom_dealer = deal
+                env.set_agents([agents[(i - r) % num_players] for i in range(num_players)])
+                _, payoffs = env.run(is_training=False)
+                for i in range(num_players):
+                    board_payoffs[i] += payoffs[(i + r) % num_players] / rotations
+                if replay:
+                    dealt = game.get_deal()
+                    if deal is None:
+                        deal = dealt
+                    elif dealt != deal:
+                        raise RuntimeError('Replay {} of board {} dealt different cards'.format(r, board))
+            if replay and not bank:
+                game.custom_deck, game.custom_dealer = custom
+            for i in range(num_players):
+                totals[i] += board_payoffs[i]
+
+            # Running mean and variance of the paired difference
+            diff = board_payoffs[0] - board_payoffs[1]
+            delta = diff - mean
+            mean += delta / board
+            m2 += delta * (diff - mean)
+            std = (m2 / (board - 1)) ** 0.5 if board > 1 else float('inf')
+            yield {'boards': board,
+                   'payoffs': [total / board for total in totals],
+                   'diff': mean,
+                   'ci': z * std / board ** 0.5}
+    finally:
+        env.set_agents(agents)
+        if replay and not bank:
+            game.custom_deck, game.custom_dealer = custom
+
+def duplicate_tournament(env, num, rotations=2, confidence=0.95):
+    ''' Evaluate the agents of the environment on duplicate boards
+
+    See duplicate_tournament_iter for the arguments and the results.
+
+    Returns:
+        (dict): The results after the last board
+    '''
+    result = None
+    for result in duplicate_tournament_iter(env, num, rotations, confidence):
+        pass
+    return result
+
 def plot_curve(csv_path, save_path, algorithm):
     ''' Read data from csv file and plot the results
     '''
@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+import torch
+
+from rlcard.agents.dqn_agent import Estimator, PrioritizedMemory, SumTree
+
+class TestDQNAgent(unittest.TestCase):
+
+    def test_soft_update(self):
+        target = Estimator(num_actions=3, state_shape=[4], mlp_layers=[8], device='cpu')
+        source = Estimator(num_actions=3, state_shape=[4], mlp_layers=[8], device='cpu')
+        before = [param.clone() for param in target.qnet.parameters()]
+        params = list(target.qnet.parameters())
+        target.soft_update(source, 0.25)
+        # The parameters are updated in place
+        self.assertTrue(all(a is b for a, b in zip(params, target.qnet.parameters())))
+        for old, new, source_param in zip(before, target.qnet.parameters(), source.qnet.parameters()):
+            torch.testing.assert_close(new, 0.75 * old + 0.25 * source_param)
+        target.soft_update(source, 1.0)
+        for new, source_param in zip(target.qnet.parameters(), source.qnet.parameters()):
+            torch.testing.assert_close(new, source_param)
+
+    def test_sum_tree(self):
+        rng = np.random.RandomState(0)
+        tree = SumTree(13)
+        priorities = rng.uniform(0.1, 2.0, 13)
+        for index, priority in enumerate(priorities):
+            tree.set(index, priority)
+        priorities[[2, 7, 12]] = [5.0, 0.0, 0.5]
+        tree.update(np.array([2, 7, 12]), priorities[[2, 7, 12]])
+        self.assertAlmostEqual(tree.total(), priorities.sum())
+        for node in range(1, tree.num_leaves):
+            self.assertAlmostEqual(tree.tree[node], tree.tree[2 * node] + tree.tree[2 * node + 1])
+        # A prefix sum finds the leaf whose interval holds it
+        starts = np.cumsum(priorities) - priorities
+        nonzero = priorities > 0
+        np.testing.assert_array_equal(tree.find(starts[nonzero] + 1e-9), np.flatnonzero(nonzero))
+        # Uniform values find the leaves in proportion to their priorities
+        counts = np.bincount(tree.find(rng.uniform(0, tree.total(), 200000)), minlength=13)
+        np.testing.assert_allclose(counts / counts.sum(), priorities / priorities.sum(), atol=0.005)
+        self.assertEqual(counts[7], 0)
+
+    def test_prioritized_memory(self):
+        np.random.seed(0)
+        memory = PrioritizedMemory(memory_size=8, batch_size=4, alpha=0.5)
+        for i in range(8):
+            memory.save(np.full(3, i), i % 2, float(i), np.full(3, i + 1), np.ones(2, dtype=bool), False)
+        # New transitions get the highest priority so far
+        np.testing.assert_allclose(memory.tree.tree[memory.tree.num_leaves:][:8], np.ones(8))
+        td_errors = np.array([0.0, 3.0, 8.0, 0.5, 1.0, 0.0, 15.0, 2.0])
+        memory.update_priorities(np.arange(8), td_errors)
+        priorities = (td_errors + memory.epsilon) ** 0.5
+        self.assertAlmostEqual(memory.tree.total(), priorities.sum())
+        self.assertAlmostEqual(memory.max_priority, priorities.max())
+        memory.save(np.full(3, 8), 0, 8.0, np.full(3, 9), np.ones(2, dtype=bool), True)
+        priorities[0] = priorities.max()
+        self.assertAlmostEqual(memory.tree.total(), priorities.sum())
+
+        counts = np.zeros(8)
+        for _ in range(2000):
+            states, _, rewards, _, _, _, indices, weights = memory.sample(beta=0.4)
+            np.testing.assert_array_equal(states[:, 0], rewards)
+            probs = priorities[indices] / priorities.sum()
+            expected = (8 * probs) ** -0.4
+            np.testing.assert_allclose(weights, expected / expected.max(), rtol=1e-5)
+            counts += np.bincount(indices, minlength=8)
+        np.testing.assert_allclose(counts / counts.sum(), priorities / priorities.sum(), atol=0.01)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+import numpy as np
+
+from rlcard.agents.nfsp_agent import NFSPAgent
+
+class TestNFSPAgent(unittest.TestCase):
+
+    def _agent(self):
+        # anticipatory_param=1 always picks the best-response policy
+        agent = NFSPAgent(num_actions=4, state_shape=[3], hidden_layers_sizes=[8], q_mlp_layers=[8],
+                          anticipatory_param=1.0, device='cpu')
+        agent.sample_episode_policy()
+        return agent
+
+    def test_step_batch_records_active_rows(self):
+        agent = self._agent()
+        obs = np.arange(12, dtype=np.float32).reshape(4, 3)
+        legal_masks = np.array([[1, 1, 0, 0], [0, 0, 1, 0], [1, 0, 0, 1], [0, 0, 0, 0]], dtype=bool)
+
+        actions = agent.step_batch(obs, legal_masks, active=np.array([True, False, True, False]))
+        self.assertTrue(all(legal_masks[i, actions[i]] for i in range(3)))
+        self.assertEqual(len(agent._reservoir_buffer), 2)
+        recorded = agent._reservoir_buffer.sample(2)
+        self.assertEqual(sorted(transition.info_state.tolist() for transition in recorded),
+                         [obs[0].tolist(), obs[2].tolist()])
+        for transition in recorded:
+            row = 0 if transition.info_state[0] == obs[0, 0] else 2
+            self.assertEqual(np.flatnonzero(transition.action_probs).tolist(), [actions[row]])
+
+    def test_step_batch_skips_rows_without_legal_actions(self):
+        agent = self._agent()
+        obs = np.ones((3, 3), dtype=np.float32)
+        legal_masks = np.array([[1, 0, 0, 0], [0, 0, 0, 0], [0, 1, 0, 0]], dtype=bool)
+        agent.step_batch(obs, legal_masks)
+        self.assertEqual(len(agent._reservoir_buffer), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+
+import numpy as np
+
+import rlcard
+from rlcard.agents.pimc_agent import PIMCAgent
+from rlcard.games.euchre.utils import CARD_INDEX, CARD_LIST
+
+def _mask(cards):
+    mask = 0
+    for card in cards:
+        mask |= 1 << CARD_INDEX[card]
+    return mask
+
+def _decisions(engine, num_hands, seed=0):
+    ''' The env, the state and the true hand masks at every decision of random hands '''
+    rng = np.random.RandomState(seed)
+    for _ in range(num_hands):
+        config = {'custom_deck': list(rng.permutation(CARD_LIST)), 'custom_dealer_id': int(rng.randint(4)),
+                  'game_engine': engine}
+        env = rlcard.make('euchre', config=config)
+        state, _ = env.reset()
+        while not env.is_over():
+            hands = [_mask(env.game.get_state(seat)['hand']) for seat in range(4)]
+            yield env, state, hands
+            # The engines list the legal actions in different orders
+            legal_actions = sorted(state['legal_actions'])
+            state, _ = env.step(legal_actions[rng.randint(len(legal_actions))])
+
+class TestPIMCAgent(unittest.TestCase):
+
+    def test_voids_hold(self):
+        voids = {}
+        for engine in ['default', 'bitboard']:
+            voids[engine] = []
+            for _, state, hands in _decisions(engine, 60):
+                if state['trump'] is None:
+                    continue
+                played = [[CARD_INDEX[card] for card in cards] for cards in state['played']]
+                seat_voids = PIMCAgent._voids(state, played, state['trump'])
+                for seat in range(4):
+                    self.assertEqual(hands[seat] & seat_voids[seat], 0)
+                voids[engine].append(seat_voids)
+        # Both engines give the same state, so the same voids
+        self.assertEqual(voids['default'], voids['bitboard'])
+
+    def test_samples_are_consistent(self):
+        agent = PIMCAgent(seed=0)
+        for engine in ['default', 'bitboard']:
+            for env, state, hands in _decisions(engine, 30):
+                me, dealer, trump = state['player_id'], state['dealer_actor'], state['trump']
+                played = [[CARD_INDEX[card] for card in cards] for cards in state['played']]
+                seen = _mask(card for cards in state['played'] for card in cards)
+                voids = [0, 0, 0, 0] if trump is None else agent._voids(state, played, trump)
+                flipped = 1 << CARD_INDEX[state['flipped']]
+                picked_up = state['flipped_choice'][1]
+                sampler = agent._sampler(state)
+                for _ in range(5):
+                    sample = sampler()
+                    self.assertEqual(sample[me], hands[me])
+                    self.assertEqual([bin(hand).count('1') for hand in sample],
+                                     [bin(hand).count('1') for hand in hands])
+                    self.assertEqual(sample[0] & sample[1] | (sample[0] | sample[1]) & (sample[2] | sample[3])
+                                     | sample[2] & sample[3], 0)
+                    for seat in range(4):
+                        self.assertEqual(sample[seat] & seen, 0)
+                        self.assertEqual(sample[seat] & voids[seat], 0)
+                        if seat != dealer or not picked_up:
+                            # Only the dealer can hold the flipped card, once picked up
+                            self.assertEqual(sample[seat] & flipped, 0)
+                    if hands[dealer] & flipped:
+                        self.assertTrue(sample[dealer] & flipped)
+
+    def test_pool_matches_in_process(self):
+        env = rlcard.make('euchre', config={'seed': 3})
+        state, _ = env.reset()
+        in_process = PIMCAgent(num_samples=7, seed=0)
+        pool = PIMCAgent(num_samples=7, num_workers=2, chunk_size=3, seed=0)
+        try:
+            for _ in range(3):
+                action, info = in_process.eval_step(state)
+                pool_action, pool_info = pool.eval_step(state)
+                self.assertEqual(pool_action, action)
+                self.assertEqual(pool_info, info)
+                if info:
+                    self.assertEqual(info['samples'], 7)
+                state, _ = env.step(action)
+
+            limited = PIMCAgent(num_samples=1000, time_limit=0.05, num_workers=2, chunk_size=3, seed=0)
+            try:
+                while len(state['legal_actions']) == 1:
+                    state, _ = env.step(list(state['legal_actions'])[0])
+                _, info = limited.eval_step(state)
+                self.assertGreaterEqual(info['samples'], 1)
+                self.assertLess(info['samples'], 1000)
+            finally:
+                limited.close()
+        finally:
+            pool.close()
+
+if __name__ == '__main__':
+    unittest.main()
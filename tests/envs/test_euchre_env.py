@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+
+import rlcard
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.games.euchre.utils import CARD_LIST
+
+def _deal(env):
+    ''' The hands, flipped card and dealer of the current hand '''
+    game = env.game
+    hands = tuple(tuple(sorted(game.get_state(player_id)['hand'])) for player_id in range(4))
+    return hands, game.get_state(0)['flipped'], game.dealer_player_id
+
+class TestEuchreEnv(unittest.TestCase):
+
+    def test_reseed_deals_same_hands(self):
+        for engine in ['default', 'bitboard']:
+            env = rlcard.make('euchre', config={'seed': 5, 'game_engine': engine})
+            env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+            env.reset()
+            first = _deal(env)
+            # Deal a few hands so the reused deck is no longer in its first order
+            for _ in range(3):
+                env.run(is_training=False)
+            for _ in range(2):
+                env.seed(5)
+                env.reset()
+                self.assertEqual(_deal(env), first)
+
+            fresh = rlcard.make('euchre', config={'seed': 5, 'game_engine': engine})
+            fresh.reset()
+            self.assertEqual(_deal(fresh), first)
+
+    def test_engines_encode_same_obs(self):
+        rng = np.random.RandomState(0)
+        for _ in range(20):
+            config = {'custom_deck': list(rng.permutation(CARD_LIST)), 'custom_dealer_id': int(rng.randint(4))}
+            default = rlcard.make('euchre', config=dict(config, game_engine='default'))
+            bitboard = rlcard.make('euchre', config=dict(config, game_engine='bitboard'))
+            state, _ = default.reset()
+            other, _ = bitboard.reset()
+            while True:
+                np.testing.assert_array_equal(state['obs'], other['obs'])
+                self.assertEqual(sorted(state['hand']), sorted(other['hand']))
+                # Both engines list the played cards of each seat in play order
+                self.assertEqual(state['played'], other['played'])
+                if default.is_over():
+                    break
+                legal_actions = list(state['legal_actions'])
+                action = legal_actions[rng.randint(len(legal_actions))]
+                state, _ = default.step(action)
+                other, _ = bitboard.step(action)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+
+import rlcard
+from rlcard.envs import SubprocVecEnv
+from rlcard.utils import seeding
+
+class TestSubprocVecEnv(unittest.TestCase):
+
+    def _check_against_envs(self, env_id, num_workers, envs_per_worker):
+        vec_env = SubprocVecEnv(env_id, num_workers, envs_per_worker, seed=5)
+        try:
+            # In-process environments with the seeds of the workers
+            envs = [rlcard.make(env_id, {'seed': seed}) for seed in seeding.spawn_seeds(5, vec_env.num_envs)]
+            obs, masks, player_ids = vec_env.reset()
+            states = [env.reset() for env in envs]
+            rng = np.random.RandomState(0)
+            while not vec_env.is_over().all():
+                for i, (state, player_id) in enumerate(states):
+                    if envs[i].is_over():
+                        continue
+                    np.testing.assert_allclose(obs[i], state['obs'].reshape(-1))
+                    np.testing.assert_array_equal(masks[i], state['legal_mask'])
+                    self.assertEqual(player_ids[i], player_id)
+                actions = np.array([rng.choice(np.flatnonzero(mask)) if mask.any() else 0 for mask in masks])
+                obs, masks, player_ids, dones = vec_env.step(actions)
+                for i, env in enumerate(envs):
+                    if not env.is_over():
+                        states[i] = env.step(int(actions[i]))
+                    self.assertEqual(dones[i], env.is_over())
+            for i, env in enumerate(envs):
+                payoffs = env.get_payoffs()
+                np.testing.assert_allclose(vec_env.get_payoffs()[i], [payoffs[j] for j in range(env.num_players)])
+
+            # Restarting some environments leaves the others finished
+            obs, masks, player_ids = vec_env.reset(np.arange(vec_env.num_envs) % 2 == 0)
+            for i, env in enumerate(envs):
+                self.assertEqual(vec_env.is_over()[i], i % 2 == 1)
+                if i % 2 == 0:
+                    state, player_id = env.reset()
+                    np.testing.assert_allclose(obs[i], state['obs'].reshape(-1))
+                    self.assertEqual(player_ids[i], player_id)
+        finally:
+            vec_env.close()
+
+    def test_matches_in_process_envs(self):
+        self._check_against_envs('euchre', 2, 3)
+        self._check_against_envs('leduc-holdem', 3, 1)
+
+    def test_worker_error(self):
+        vec_env = SubprocVecEnv('euchre', 1, 2, seed=0)
+        try:
+            vec_env.reset()
+            with self.assertRaises(RuntimeError):
+                vec_env.step(np.array([53, 53]))
+        finally:
+            vec_env.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+import rlcard
+from rlcard.games.euchre import BatchGame, BitboardGame
+from rlcard.games.euchre.utils import ACTION_LIST, ACTION_SPACE, CARD_LIST, OBS_SIZE
+
+def _single_games(batch):
+    ''' A single game playing each deal of the batch '''
+    games = []
+    for i in range(batch.num_games):
+        dealer = int(batch.dealer[i])
+        deck = []
+        for k in range(4):
+            deck += [CARD_LIST[card] for card in np.flatnonzero(batch.hands[i, (dealer + 1 + k) % 4])]
+        rest = [card for card in range(len(CARD_LIST))
+                if not batch.hands[i, :, card].any() and card != batch.flipped[i]]
+        deck += [CARD_LIST[batch.flipped[i]]] + [CARD_LIST[card] for card in rest]
+        game = BitboardGame(config={'custom_deck': deck, 'custom_dealer_id': dealer})
+        game.init_game()
+        games.append(game)
+    return games
+
+class TestBatchEuchreGame(unittest.TestCase):
+
+    def test_matches_single_games(self):
+        batch = BatchGame(40)
+        batch.np_random = np.random.RandomState(0)
+        batch.init_game()
+        games = _single_games(batch)
+        env = rlcard.make('euchre')
+        rng = np.random.RandomState(1)
+        while not batch.over.all():
+            legal_masks, obs = batch.get_legal_mask(), batch.get_obs()
+            actions = np.zeros(batch.num_games, dtype=int)
+            for i, game in enumerate(games):
+                self.assertEqual(batch.over[i], game.is_over())
+                if game.is_over():
+                    continue
+                legal = sorted(ACTION_SPACE[action] for action in game.get_legal_actions())
+                self.assertEqual(np.flatnonzero(legal_masks[i]).tolist(), legal)
+                self.assertEqual(batch.current_player[i], game.current_player)
+                state = game.get_state(game.current_player)
+                np.testing.assert_array_equal(obs[i], env._encode_state(state, np.zeros(OBS_SIZE, dtype=np.int8)))
+                actions[i] = legal[rng.randint(len(legal))]
+                game.step(ACTION_LIST[actions[i]])
+            batch.step(actions)
+        for i, game in enumerate(games):
+            self.assertTrue(game.is_over())
+            payoffs = game.get_payoffs()
+            self.assertEqual(batch.payoffs[i].tolist(), [payoffs[j] for j in range(4)])
+
+    def test_init_game_restarts_selected_deals(self):
+        batch = BatchGame(6)
+        batch.np_random = np.random.RandomState(0)
+        batch.init_game()
+        hands = batch.hands.copy()
+        batch.init_game(np.array([False, True, False, False, True, False]))
+        for i in range(6):
+            self.assertEqual((batch.hands[i] == hands[i]).all(), i not in (1, 4))
+        self.assertEqual(batch.hands.sum(axis=(1, 2)).tolist(), [20] * 6)
+
+if __name__ == '__main__':
+    unittest.main()
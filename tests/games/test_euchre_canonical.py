@@ -0,0 +1,63 @@
+import unittest
+
+import numpy as np
+
+import rlcard
+from rlcard.games.euchre import canonical
+from rlcard.games.euchre.utils import CARD_INDEX, CARD_OBJECTS
+
+def _play_states(engine, num_hands, seed=0):
+    ''' Copies of the raw states of random hands, with their legal actions '''
+    env = rlcard.make('euchre', config={'seed': seed, 'game_engine': engine})
+    rng = np.random.RandomState(seed)
+    for _ in range(num_hands):
+        state, player_id = env.reset()
+        while not env.is_over():
+            raw = dict(env.game.get_state(player_id))
+            # The default engine's lists are shared with the game
+            raw['center'] = list(raw['center'])
+            raw['order'] = list(raw['order'])
+            raw['played'] = [list(cards) for cards in raw['played']]
+            yield raw, list(state['legal_actions'])
+            legal_actions = list(state['legal_actions'])
+            state, player_id = env.step(legal_actions[rng.randint(len(legal_actions))])
+
+class TestEuchreCanonical(unittest.TestCase):
+
+    def test_relabelings_share_key(self):
+        for engine in ['default', 'bitboard']:
+            for state, legal_actions in _play_states(engine, 20):
+                key, k = canonical.canonicalize(state)
+                for j in range(len(canonical.SUIT_PERMUTATIONS)):
+                    self.assertEqual(canonical.canonicalize(canonical.permute_state(state, j))[0], key)
+                for action in legal_actions:
+                    canonical_action = canonical.to_canonical_action(action, k)
+                    self.assertEqual(canonical.from_canonical_action(canonical_action, k), action)
+
+    def test_different_states_get_different_keys(self):
+        for state, _ in _play_states('default', 20):
+            if len(state['center']) == 1 and len(state['played'][state['order'][0]]) == 2:
+                break
+        key = canonical.canonicalize(state)[0]
+        seen = {card for cards in state['played'] for card in cards} | set(state['hand']) | {state['flipped']}
+        unseen = [card for card in CARD_INDEX if card not in seen]
+
+        # Another card in the trick in progress
+        other = dict(state)
+        other['center'] = [CARD_OBJECTS[CARD_INDEX[unseen[0]]]]
+        self.assertNotEqual(canonical.canonicalize(other)[0], key)
+
+        # The same cards played in the other order
+        leader = state['order'][0]
+        swapped = dict(state)
+        swapped['played'] = [list(cards) for cards in state['played']]
+        swapped['played'][leader] = swapped['played'][leader][::-1]
+        self.assertNotEqual(canonical.canonicalize(swapped)[0], key)
+
+        # The same trick led by another seat
+        moved = dict(state)
+        moved['order'] = [(leader + 1) % 4]
+        self.assertNotEqual(canonical.canonicalize(moved)[0], key)
+
+if __name__ == '__main__':
+    unittest.main()
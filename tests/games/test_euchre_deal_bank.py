@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import rlcard
+from rlcard.games.euchre.deal_bank import DealBank, generate_deal_bank
+from rlcard.games.euchre.utils import CARD_LIST
+
+class TestEuchreDealBank(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'deals.npy')
+        generate_deal_bank(self.path, 50, seed=0, chunk_size=16)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_generate_deal_bank(self):
+        bank = DealBank(self.path)
+        self.assertEqual(len(bank), 50)
+        for index in range(len(bank)):
+            deck, dealer = bank.get_deal(index)
+            self.assertEqual(sorted(deck), sorted(CARD_LIST))
+            self.assertIn(dealer, range(4))
+            self.assertEqual(bank.get_deal(index, rotation=1), (deck, (dealer + 1) % 4))
+        self.assertGreater(len(set(tuple(bank.get_deal(index)[0]) for index in range(len(bank)))), 1)
+        # The same seed writes the same bank
+        path = os.path.join(self.directory.name, 'again.npy')
+        generate_deal_bank(path, 50, seed=0, chunk_size=16)
+        np.testing.assert_array_equal(np.load(path), np.load(self.path))
+
+    def test_not_a_deal_bank(self):
+        path = os.path.join(self.directory.name, 'other.npy')
+        np.save(path, np.zeros((3, 4), dtype=np.uint8))
+        with self.assertRaises(ValueError):
+            DealBank(path)
+
+    def test_env_plays_bank_deals(self):
+        bank = DealBank(self.path)
+        for engine in ['default', 'bitboard']:
+            env = rlcard.make('euchre', config={'game_engine': engine, 'deal_bank': self.path, 'deal_index': 48})
+            for index in [48, 49, 0, 1]:
+                env.reset()
+                self.assertEqual(env.game.get_deal(), bank.get_deal(index))
+            env.set_deal(7)
+            env.reset()
+            self.assertEqual(env.game.get_deal(), bank.get_deal(7))
+            hands = [sorted(env.game.get_state(player_id)['hand']) for player_id in range(4)]
+            env.set_deal(7, rotation=1)
+            env.reset()
+            self.assertEqual(env.game.get_deal(), bank.get_deal(7, rotation=1))
+            # Every hand moves one seat to the left
+            for player_id in range(4):
+                self.assertEqual(sorted(env.game.get_state((player_id + 1) % 4)['hand']), hands[player_id])
+
+    def test_deal_bank_with_match_points(self):
+        with self.assertRaises(ValueError):
+            rlcard.make('euchre', config={'deal_bank': self.path, 'match_points': 10})
+
+if __name__ == '__main__':
+    unittest.main()
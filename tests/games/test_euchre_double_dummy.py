@@ -0,0 +1,90 @@
+import random
+import unittest
+from functools import lru_cache
+
+from rlcard.games.euchre.double_dummy import DoubleDummySolver, _STRENGTH
+from rlcard.games.euchre.utils import BB_SUITS, CARD_LIST, CARD_SUIT, FOLLOW_MASK, TRUMP_MASK
+
+def _suit_of(card, trump):
+    return trump if (1 << card) & TRUMP_MASK[trump] else CARD_SUIT[card]
+
+def _legal(hand, trick, trump):
+    if not trick:
+        return hand
+    return hand & FOLLOW_MASK[(trump, _suit_of(trick[0], trump))] or hand
+
+def _brute_force(hands, trump, leader, trick):
+    ''' Team 0 tricks under optimal play, by plain minimax '''
+    @lru_cache(maxsize=None)
+    def search(hands, leader, trick):
+        seat = (leader + len(trick)) % 4
+        if not trick and hands[seat] == 0:
+            return 0
+        values = []
+        for card in range(len(CARD_LIST)):
+            if _legal(hands[seat], trick, trump) >> card & 1:
+                values.append(_play(hands, leader, trick, seat, card))
+        return max(values) if seat % 2 == 0 else min(values)
+
+    def _play(hands, leader, trick, seat, card):
+        hands = hands[:seat] + (hands[seat] & ~(1 << card),) + hands[seat + 1:]
+        trick = trick + (card,)
+        if len(trick) < 4:
+            return search(hands, leader, trick)
+        strength = _STRENGTH[(trump, _suit_of(trick[0], trump))]
+        values = [strength[c] for c in trick]
+        winner = (leader + values.index(max(values))) % 4
+        return (1 if winner % 2 == 0 else 0) + search(hands, winner, ())
+
+    return search(tuple(hands), leader, tuple(trick)), _play
+
+def _random_position(rng, hand_size, partial_trick=True):
+    ''' Random hands of hand_size cards, trump, leader and a random partial trick '''
+    deck = list(range(len(CARD_LIST)))
+    rng.shuffle(deck)
+    hands = [sum(1 << card for card in deck[hand_size * i:hand_size * (i + 1)]) for i in range(4)]
+    trump, leader = rng.choice(BB_SUITS), rng.randrange(4)
+    trick = []
+    for i in range(rng.randrange(4) if partial_trick else 0):
+        seat = (leader + i) % 4
+        legal = _legal(hands[seat], trick, trump)
+        card = rng.choice([c for c in range(len(CARD_LIST)) if legal >> c & 1])
+        hands[seat] &= ~(1 << card)
+        trick.append(card)
+    return hands, trump, leader, trick
+
+class TestDoubleDummySolver(unittest.TestCase):
+
+    def _check(self, solver, hands, trump, leader, trick):
+        seat = (leader + len(trick)) % 4
+        total = bin(hands[seat]).count('1')
+        expected, play = _brute_force(hands, trump, leader, trick)
+        if not trick:
+            self.assertEqual(solver.solve(hands, trump, leader), (expected, total - expected))
+
+        values = solver.solve_moves(hands, trump, leader, trick)
+        legal = _legal(hands[seat], trick, trump)
+        self.assertEqual(set(values), {card for card in range(len(CARD_LIST)) if legal >> card & 1})
+        for card, value in values.items():
+            team_0 = play(tuple(hands), leader, tuple(trick), seat, card)
+            self.assertEqual(value, team_0 if seat % 2 == 0 else total - team_0)
+
+    def test_full_deals(self):
+        rng = random.Random(0)
+        solver = DoubleDummySolver()
+        for _ in range(3):
+            self._check(solver, *_random_position(rng, 5, partial_trick=False))
+
+    def test_partial_tricks(self):
+        rng = random.Random(1)
+        solver = DoubleDummySolver()
+        for _ in range(40):
+            self._check(solver, *_random_position(rng, rng.choice([2, 3])))
+
+    def test_card_strings(self):
+        solver = DoubleDummySolver()
+        hands = [['HJ', 'DJ'], ['HA', 'SA'], ['H9', 'CA'], ['S9', 'C9']]
+        self.assertEqual(solver.solve(hands, 'H', 0), (2, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+import rlcard
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.games.euchre import BitboardGame, Game, Match
+
+class TestEuchreMatch(unittest.TestCase):
+
+    def test_match_play(self):
+        for engine in ['default', 'bitboard']:
+            env = rlcard.make('euchre', config={'seed': 0, 'game_engine': engine, 'match_points': 10})
+            env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+            state, _ = env.reset()
+            self.assertEqual(state['match_score'], [0, 0])
+            self.assertEqual(state['hand_number'], 0)
+            _, payoffs = env.run(is_training=False)
+            # Team 0 is players 0 and 2
+            winner = 0 if payoffs[0] > 0 else 1
+            match_score = env.game.get_state(0)['match_score']
+            self.assertGreaterEqual(match_score[winner], 10)
+            self.assertLess(match_score[1 - winner], 10)
+            self.assertEqual(payoffs, {0: 1, 1: -1, 2: 1, 3: -1} if winner == 0 else {0: -1, 1: 1, 2: -1, 3: 1})
+
+    def test_match_scoring(self):
+        for engine in [Game, BitboardGame]:
+            for match_points in [1, 5, 10]:
+                config = {'match_points': match_points, 'custom_dealer_id': 2}
+                match = Match(config=config, game=engine(config=config))
+                match.np_random = np.random.RandomState(match_points)
+                match.init_game()
+                expected_score, dealer = [0, 0], 2
+                while not match.is_over():
+                    self.assertEqual(match.game.dealer_player_id, dealer)
+                    self.assertEqual(match.get_state(match.get_player_id())['match_score'], expected_score)
+                    hand_number = match.hand_number
+                    legal = sorted(match.get_legal_actions())
+                    match.step(legal[match.np_random.randint(len(legal))])
+                    if match.is_over() or match.hand_number != hand_number:
+                        # The hand ended, its points go to the winning team
+                        self.assertIn(match.game.points, [1, 2, 4])
+                        expected_score[0 if 0 in match.game.winner else 1] += match.game.points
+                        self.assertEqual(match.match_score, expected_score)
+                        if not match.is_over():
+                            self.assertEqual(match.hand_number, hand_number + 1)
+                            dealer = (dealer + 1) % 4
+                winner = 0 if 0 in match.winner else 1
+                self.assertGreaterEqual(match.match_score[winner], match_points)
+                self.assertLess(match.match_score[1 - winner], match_points)
+                self.assertFalse(match.step_back())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+import rlcard
+
+def _snapshot(env):
+    game = env.game
+    player_id = game.get_player_id()
+    state = env.get_state(player_id)
+    return (player_id, state['obs'].tolist(), sorted(state['legal_actions']), list(game.score))
+
+class TestEuchreStepBack(unittest.TestCase):
+
+    def test_step_back_restores_every_state(self):
+        for engine in ['default', 'bitboard']:
+            for seed in range(20):
+                env = rlcard.make('euchre', config={'seed': seed, 'game_engine': engine, 'allow_step_back': True})
+                rng = np.random.RandomState(seed)
+                env.reset()
+                snapshots = []
+                while not env.is_over():
+                    snapshots.append(_snapshot(env))
+                    legal = sorted(env.get_state(env.get_player_id())['legal_actions'])
+                    env.step(legal[rng.randint(len(legal))])
+                payoffs = env.get_payoffs()
+                self.assertTrue(any(payoffs))
+                while snapshots:
+                    self.assertTrue(env.step_back())
+                    self.assertFalse(env.is_over())
+                    self.assertEqual(_snapshot(env), snapshots.pop())
+                self.assertFalse(env.step_back())
+
+    def test_step_back_then_replay(self):
+        for engine in ['default', 'bitboard']:
+            env = rlcard.make('euchre', config={'seed': 3, 'game_engine': engine, 'allow_step_back': True})
+            rng = np.random.RandomState(3)
+            env.reset()
+            actions = []
+            while not env.is_over():
+                legal = sorted(env.get_state(env.get_player_id())['legal_actions'])
+                actions.append(legal[rng.randint(len(legal))])
+                env.step(actions[-1])
+            payoffs = env.get_payoffs()
+            for _ in range(len(actions) // 2):
+                env.step_back()
+            for action in actions[len(actions) - len(actions) // 2:]:
+                env.step(action)
+            self.assertTrue(env.is_over())
+            np.testing.assert_array_equal(env.get_payoffs(), payoffs)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+import rlcard
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.games.euchre.deal_bank import generate_deal_bank
+from rlcard.utils.utils import duplicate_tournament_iter
+
+def _record_deals(env):
+    ''' Record the hands, flipped card and dealer of every reset of env '''
+    deals = []
+    reset = env.reset
+
+    def recording_reset():
+        result = reset()
+        game = env.game
+        hands = tuple(tuple(sorted(game.get_state(player_id)['hand'])) for player_id in range(4))
+        deals.append((hands, game.get_state(0)['flipped'], game.dealer_player_id))
+        return result
+
+    env.reset = recording_reset
+    return deals
+
+class TestDuplicateTournament(unittest.TestCase):
+
+    def _check_boards(self, env, num, rotations):
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        deals = _record_deals(env)
+        for _ in duplicate_tournament_iter(env, num, rotations=rotations):
+            pass
+        self.assertEqual(len(deals), num * rotations)
+        boards = [deals[i:i + rotations] for i in range(0, len(deals), rotations)]
+        for board in boards:
+            self.assertEqual(board, [board[0]] * rotations)
+        # Different boards are different deals
+        self.assertEqual(len(set(board[0] for board in boards)), num)
+
+    def test_rotations_deal_same_hands(self):
+        for engine in ['default', 'bitboard']:
+            env = rlcard.make('euchre', config={'seed': 3, 'game_engine': engine})
+            self._check_boards(env, 5, 4)
+            self.assertIsNone(env.game.custom_deck)
+            self.assertIsNone(env.game.custom_dealer)
+
+    def test_rotations_deal_same_hands_from_bank(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'deals.npy')
+            generate_deal_bank(path, 10, seed=0)
+            env = rlcard.make('euchre', config={'seed': 3, 'deal_bank': path, 'deal_index': 2})
+            self._check_boards(env, 5, 2)
+            self.assertEqual(env.deal_index, 7)
+            del env
+
+if __name__ == '__main__':
+    unittest.main()